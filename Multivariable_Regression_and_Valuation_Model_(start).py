@@ -802,7 +802,7 @@ plt.show()
 sns.displot(residuals, 
             kde=True, 
             color='red')
-plt.title(f'Original model: Residuals Skew ({resid_skew}) Mean ({resid_mean})')
+plt.title(f'Original model: Residuals Skew ({res_skew}) Mean ({res_mean})')
 plt.show()
 
 
@@ -901,6 +901,24 @@ dollar_est = np.e**log_estimate * 1000
 print(f'The property is estimated to be worth ${dollar_est:.6}')
 
 
+# ### Valuing Many Properties at Once
+# 
+# Building a `property_stats` DataFrame per property does not scale to thousands of candidate projects. `BatchValuer` starts every property from the same `average_vals` baseline and prices a whole batch of overrides with one matrix-vector product. 
+
+# In[ ]:
+
+
+from house_prices.valuation import BatchValuer
+
+valuer = BatchValuer.from_model(log_regr, features)
+valuer.value({'RM': [6, 7, 8], 
+              'PTRATIO': students_per_classroom, 
+              'DIS': distance_to_town, 
+              'CHAS': int(next_to_river), 
+              'NOX': pollution, 
+              'LSTAT': amount_of_poverty})
+
+
 # In[ ]:
 
 
@@ -0,0 +1,66 @@
+"""Cached-statistics CV vs. refitting ``LinearRegression`` per fold and candidate.
+
+    python benchmarks/bench_cv.py --repeats 3
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from sklearn.model_selection import KFold, cross_val_score
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from house_prices import FEATURES  # noqa: E402
+from house_prices.cv import CrossValidator, drop_one_candidates  # noqa: E402
+from house_prices.data import load_data, split_features  # noqa: E402
+from house_prices.streaming import TARGET_TRANSFORMS, target_matrix  # noqa: E402
+
+
+def naive(X, price, candidates, k, seeds):
+    Y = target_matrix(price, TARGET_TRANSFORMS)
+    targets = list(TARGET_TRANSFORMS)
+    means = []
+    for target, features in candidates:
+        cols = [FEATURES.index(f) for f in features]
+        scores = [cross_val_score(LinearRegression(), X[:, cols], Y[:, targets.index(target)],
+                                  cv=KFold(k, shuffle=True, random_state=seed))
+                  for seed in seeds]
+        means.append(np.mean(scores))
+    return np.array(means)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    features, target = split_features(load_data())
+    X, price = features.values, target.values
+    candidates = drop_one_candidates()
+
+    start = time.perf_counter()
+    cv = CrossValidator(X, price, k=args.k, repeats=args.repeats, workers=args.workers)
+    board = cv.leaderboard(candidates)
+    fast = time.perf_counter() - start
+
+    seeds = np.random.RandomState(0).randint(2**31 - 1, size=args.repeats)
+    start = time.perf_counter()
+    expected = naive(X, price, candidates, args.k, seeds)
+    slow = time.perf_counter() - start
+
+    got = [cv.scores(t, f).mean() for t, f in candidates]
+    np.testing.assert_allclose(got, expected, rtol=1e-9)
+    print(board.head(10).to_string())
+    print(f'\n{len(candidates)} candidates x {args.k} folds x {args.repeats} repeats')
+    print(f'cached statistics: {fast:8.3f} s')
+    print(f'naive refits:      {slow:8.3f} s  ({slow / fast:.0f}x slower)')
+
+
+if __name__ == '__main__':
+    main()
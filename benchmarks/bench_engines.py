@@ -0,0 +1,74 @@
+"""Runtime and test R² of each regression engine against ``LinearRegression``.
+
+Uses the notebook's 80/20 split (``random_state=10``) for both the raw and
+log ``PRICE`` targets.  Path engines pick their penalty on a validation
+split carved out of the training rows, are refitted on all training rows at
+that penalty, and only then scored on the test rows.  ``--wide`` adds random
+noise columns to test the wide-data paths::
+
+    python benchmarks/bench_engines.py
+    python benchmarks/bench_engines.py --wide 2000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.linear_model import LinearRegression
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from house_prices.data import load_data, split_features  # noqa: E402
+from house_prices.engines import ElasticNetPath, HuberRegression, RidgePath  # noqa: E402
+from house_prices.split import TrainTestSplit, split_indices, take_rows  # noqa: E402
+
+
+def engines():
+    return {
+        'LinearRegression': lambda: LinearRegression(),
+        'RidgePath (50 alphas)': lambda: RidgePath(np.logspace(-3, 3, 50)),
+        'Lasso path (50 alphas)': lambda: ElasticNetPath(l1_ratio=1.0, eps=1e-5),
+        'ElasticNet path (50 alphas)': lambda: ElasticNetPath(l1_ratio=0.5, eps=1e-5),
+        'HuberRegression': lambda: HuberRegression(),
+    }
+
+
+def run(name, make, X_train, X_test, y_train, y_test):
+    """Fit time and test R²; path engines are tuned without touching the test rows."""
+    start = time.perf_counter()
+    model = make()
+    if hasattr(model, 'alphas'):
+        fit_index, val_index = split_indices(len(X_train))
+        model.fit(take_rows(X_train, fit_index), take_rows(y_train, fit_index))
+        model.select(take_rows(X_train, val_index), take_rows(y_train, val_index))
+        alpha = model.alpha_
+        model = make()
+        model.alphas = [alpha]
+    model.fit(X_train, y_train)
+    secs = time.perf_counter() - start
+    return secs, model.score(X_test, y_test)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--wide', type=int, default=0, help='number of extra noise columns')
+    args = parser.parse_args(argv)
+
+    features, target = split_features(load_data())
+    X = features.values
+    if args.wide:
+        noise = np.random.default_rng(0).normal(size=(len(X), args.wide))
+        X = np.hstack([X, noise])
+    split = TrainTestSplit(X)
+    for label, y in (('PRICE', target.values), ('log PRICE', np.log(target.values))):
+        X_train, X_test, y_train, y_test = split.split(y)
+        print(f'\n{label}: {X_train.shape[0]} train rows, {X.shape[1]} features')
+        for name, make in engines().items():
+            secs, r2 = run(name, make, X_train, X_test, y_train, y_test)
+            print(f'  {name:<28} {secs * 1000:9.1f} ms   test R² {r2:.4f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Scaling of the process-pool fit at 1, 2, 4 and 8 workers.
+
+Writes a Boston-shaped CSV by resampling ``data/boston.csv`` rows with a
+little noise, then times :func:`house_prices.parallel.fit_csv_parallel`::
+
+    python benchmarks/bench_parallel_fit.py --rows 5000000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from house_prices.data import load_data  # noqa: E402
+from house_prices.parallel import fit_csv_parallel  # noqa: E402
+from house_prices.streaming import fit_csv  # noqa: E402
+
+
+def write_resampled_csv(path, rows, seed=0, chunk=500_000):
+    data = load_data()
+    rng = np.random.default_rng(seed)
+    scale = data.std().values * 0.01
+    with open(path, 'w') as f:
+        f.write(',' + ','.join(data.columns) + '\n')
+        for start in range(0, rows, chunk):
+            n = min(chunk, rows - start)
+            sample = data.sample(n, replace=True, random_state=rng.integers(2**32))
+            sample.iloc[:, :] = np.abs(sample.values + rng.normal(0, scale, sample.shape))
+            sample.index = np.arange(start, start + n)
+            sample.to_csv(f, header=False, float_format='%.6g')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'listings.csv'
+        write_resampled_csv(path, args.rows)
+        print(f'rows: {args.rows:,}  file: {path.stat().st_size / 2**20:,.0f} MiB')
+
+        start = time.perf_counter()
+        reference = fit_csv(path)
+        print(f'{"streaming":>10}: {time.perf_counter() - start:8.2f} s')
+
+        baseline = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            fits = fit_csv_parallel(path, workers=workers)
+            secs = time.perf_counter() - start
+            baseline = baseline or secs
+            for name, fit in fits.items():
+                np.testing.assert_allclose(fit.coef_, reference[name].coef_, rtol=1e-8, atol=1e-10)
+            print(f'{workers:>2} workers: {secs:8.2f} s  speedup {baseline / secs:5.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Load generator for the valuation service: p50/p99 latency and throughput.
+
+Exports the log-price model, starts ``python -m house_prices.service`` in a
+subprocess and drives it from concurrent keep-alive connections::
+
+    python benchmarks/bench_service.py --connections 64 --requests 20000
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+async def client(host, port, specs, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for spec in specs:
+            body = json.dumps(spec).encode()
+            start = time.perf_counter()
+            writer.write(b'POST /value HTTP/1.1\r\nHost: bench\r\n'
+                         b'Content-Type: application/json\r\n'
+                         + f'Content-Length: {len(body)}\r\n\r\n'.encode() + body)
+            await writer.drain()
+            await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line == b'\r\n':
+                    break
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':')[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def drive(host, port, connections, requests, seed=0):
+    rng = np.random.default_rng(seed)
+    specs = [{'RM': float(rng.uniform(4, 9)), 'PTRATIO': float(rng.uniform(12, 22)),
+              'DIS': float(rng.uniform(1, 12)), 'CHAS': int(rng.integers(0, 2))}
+             for _ in range(requests)]
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, specs[i::connections], latencies)
+                           for i in range(connections)))
+    return np.array(latencies), time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--connections', type=int, default=64)
+    parser.add_argument('--requests', type=int, default=20_000)
+    parser.add_argument('--max-delay-ms', type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    from house_prices.data import load_data
+    from house_prices.export import export_model, fit_log_model
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = Path(tmp) / 'log_model.npz'
+        export_model(*fit_log_model(load_data()), model_path)
+        proc = subprocess.Popen([sys.executable, '-m', 'house_prices.service', str(model_path),
+                                 '--port', '0', '--max-delay-ms', str(args.max_delay_ms)],
+                                cwd=ROOT, stdout=subprocess.PIPE, text=True)
+        try:
+            banner = proc.stdout.readline()
+            host, port = banner.rsplit('//', 1)[1].strip().rsplit(':', 1)
+            latencies, secs = asyncio.run(drive(host, int(port), args.connections,
+                                                args.requests))
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    ms = latencies * 1000
+    print(f'requests:    {len(ms):,} over {args.connections} connections')
+    print(f'throughput:  {len(ms) / secs:,.0f} req/s')
+    print(f'latency p50: {np.percentile(ms, 50):.2f} ms')
+    print(f'latency p99: {np.percentile(ms, 99):.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
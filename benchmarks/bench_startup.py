@@ -0,0 +1,102 @@
+"""Cold-start import time of the fit-only and value-only entry points.
+
+Run from the repository root::
+
+    python benchmarks/bench_startup.py [--repeat 5] [--root path/to/checkout]
+
+Each entry point is imported in a fresh interpreter under
+``python -X importtime``; the report gives the median total import time, the
+heaviest top-level packages and whether any of the plotting stack (seaborn,
+plotly, matplotlib) was loaded.  ``fit-run`` adds the ``LinearRegression``
+import that ``fit_log_model`` defers to its first call.  ``notebook`` is the
+script's own import cell, i.e. what a worker paid before the package split.
+To compare against an older revision, check it out somewhere
+(``git worktree add /tmp/before <rev>``) and pass ``--root /tmp/before``.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ENTRY_POINTS = {
+    'notebook': ('import pandas as pd; import numpy as np; import seaborn as sns; '
+                 'import plotly.express as px; import matplotlib.pyplot as plt; '
+                 'from sklearn.linear_model import LinearRegression; '
+                 'from sklearn.model_selection import train_test_split'),
+    'fit': 'from house_prices.export import fit_log_model, export_model',
+    'fit-run': ('from house_prices.export import fit_log_model; '
+                'from sklearn.linear_model import LinearRegression'),
+    'value': 'from house_prices.predictor import load_model',
+    'serve': 'import house_prices.service',
+    'pipeline': 'import house_prices.pipeline',
+}
+
+PLOTTING = ('seaborn', 'plotly', 'matplotlib')
+
+
+def import_times(code, root=ROOT):
+    """``{module: (self_us, cumulative_us)}`` from one ``-X importtime`` run."""
+    env = dict(os.environ, PYTHONPATH=str(root))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True, env=env, cwd=root)
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def top_packages(times, limit=5):
+    """Heaviest top-level packages by summed self time."""
+    totals = {}
+    for name, (own, _) in times.items():
+        package = name.strip().split('.')[0]
+        totals[package] = totals.get(package, 0) + own
+    return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+
+
+def measure(code, repeat=5, root=ROOT):
+    runs = [import_times(code, root) for _ in range(repeat)]
+    totals = [sum(own for own, _ in times.values()) for times in runs]
+    last = runs[-1]
+    return {
+        'median_ms': statistics.median(totals) / 1000,
+        'min_ms': min(totals) / 1000,
+        'modules': len(last),
+        'plotting': sorted({m.split('.')[0] for m in last if m.split('.')[0] in PLOTTING}),
+        'top': top_packages(last),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--root', type=Path, default=ROOT,
+                        help='checkout to import house_prices from (default: this one)')
+    parser.add_argument('--entry', action='append', choices=sorted(ENTRY_POINTS),
+                        help='entry point to measure (repeatable; default: all)')
+    args = parser.parse_args(argv)
+
+    print(f'{"entry":<10} {"median":>10} {"min":>10} {"modules":>8}  plotting  heaviest')
+    for name in args.entry or ENTRY_POINTS:
+        try:
+            r = measure(ENTRY_POINTS[name], args.repeat, args.root.resolve())
+        except RuntimeError as e:
+            print(f'{name:<10} failed: {e}')
+            continue
+        heaviest = ', '.join(f'{p} {us / 1000:.0f}' for p, us in r['top'])
+        print(f'{name:<10} {r["median_ms"]:8.1f}ms {r["min_ms"]:8.1f}ms {r["modules"]:8d}  '
+              f'{",".join(r["plotting"]) or "-":<8}  {heaviest}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Batch valuation vs. the notebook's one-row ``log_regr.predict`` path.
+
+Run from the repository root::
+
+    python benchmarks/bench_valuation.py --properties 20000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from house_prices.data import load_data, split_features  # noqa: E402
+from house_prices.valuation import BatchValuer  # noqa: E402
+
+
+def random_specs(data, n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        'RM': rng.uniform(4, 9, n),
+        'PTRATIO': rng.uniform(12, 22, n),
+        'DIS': rng.uniform(1, 12, n),
+        'CHAS': rng.integers(0, 2, n).astype(float),
+        'NOX': rng.choice(data.NOX.values, n),
+        'LSTAT': rng.choice(data.LSTAT.values, n),
+    }
+
+
+def per_row(log_regr, features, specs, n):
+    average_vals = features.mean().values
+    out = np.empty(n)
+    for i in range(n):
+        property_stats = pd.DataFrame(data=average_vals.reshape(1, len(features.columns)),
+                                      columns=features.columns)
+        for name, values in specs.items():
+            property_stats[name] = values[i]
+        log_estimate = log_regr.predict(property_stats)[0]
+        out[i] = np.e**log_estimate * 1000
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--properties', type=int, default=20_000)
+    parser.add_argument('--row-sample', type=int, default=500,
+                        help='properties timed on the per-row path (extrapolated)')
+    args = parser.parse_args(argv)
+
+    data = load_data()
+    features, target = split_features(data)
+    X_train, _, log_y_train, _ = train_test_split(features, np.log(target),
+                                                  test_size=0.2, random_state=10)
+    log_regr = LinearRegression().fit(X_train, log_y_train)
+    specs = random_specs(data, args.properties)
+
+    start = time.perf_counter()
+    valuer = BatchValuer.from_model(log_regr, features)
+    batch = valuer.value(specs)
+    batch_secs = time.perf_counter() - start
+
+    m = min(args.row_sample, args.properties)
+    start = time.perf_counter()
+    rows = per_row(log_regr, features, specs, m)
+    row_secs = (time.perf_counter() - start) * args.properties / m
+
+    np.testing.assert_allclose(batch[:m], rows, rtol=1e-9)
+    print(f'properties:     {args.properties:,}')
+    print(f'per-row path:   {row_secs:10.4f} s (extrapolated from {m:,})')
+    print(f'batch path:     {batch_secs:10.4f} s')
+    print(f'speedup:        {row_secs / batch_secs:10.0f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""Reproducible throughput benchmarks on Boston-shaped synthetic data.
+
+Generates ``10**3 .. 10**8`` rows with :class:`house_prices.synthetic.BostonGenerator`
+(fixed seed), then measures rows/sec for each stage: CSV load, columnar
+cache build and load, split, fitting both models (sufficient statistics,
+sklearn and a streaming pass over the CSV), batch valuation and residual
+diagnostics.  Above ``IN_MEMORY_MAX_ROWS`` nothing holds the whole dataset:
+``load_csv`` and ``fit_sklearn`` are skipped, the split is timed on the
+indices alone (``split_indices``), and fitting, valuation and diagnostics
+run in ``BLOCK_ROWS`` blocks over the columnar cache's memory map.  10^8
+rows needs roughly 1 GB of RAM and 20 GB of disk in ``--workdir``.
+Results are saved as JSON; with ``--baseline`` any stage whose rows/sec
+drops by more than ``--tolerance`` fails the run::
+
+    python benchmarks/suite.py --sizes 1e3 1e4 1e5 1e6 --save-baseline
+    python benchmarks/suite.py --sizes 1e3 1e4 1e5 1e6      # exits 1 on a regression
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent))
+
+from house_prices import FEATURES, TARGET  # noqa: E402
+from house_prices.columnar import build_cache, load_table  # noqa: E402
+from house_prices.diagnostics import ResidualDiagnostics, diagnose_arrays  # noqa: E402
+from house_prices.split import TrainTestSplit, split_indices  # noqa: E402
+from house_prices.streaming import (  # noqa: E402
+    SufficientStats, fit_csv, fits_from_stats, target_matrix)
+from house_prices.synthetic import BostonGenerator  # noqa: E402
+from house_prices.valuation import BatchValuer  # noqa: E402
+
+RESULTS = ROOT / 'results'
+IN_MEMORY_MAX_ROWS = 10_000_000
+BLOCK_ROWS = 1_000_000
+
+
+def best_of(repeats, fn):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def random_overrides(rng, n):
+    return {'RM': rng.uniform(4, 9, n), 'PTRATIO': rng.uniform(12, 22, n),
+            'DIS': rng.uniform(1, 12, n), 'CHAS': rng.integers(0, 2, n)}
+
+
+def run_size(n, generator, workdir, repeats, seed):
+    csv = Path(workdir) / f'boston_{n}.csv'
+    generator.write_csv(csv, n, seed=seed)
+    timings = {}
+
+    if n <= IN_MEMORY_MAX_ROWS:
+        timings['load_csv'] = best_of(repeats, lambda: pd.read_csv(csv, index_col=0))
+    timings['fit_csv'] = best_of(repeats if n <= IN_MEMORY_MAX_ROWS else 1,
+                                 lambda: fit_csv(csv))
+    timings['columnar_build'] = best_of(1, lambda: build_cache(csv))
+    timings['columnar_load'] = best_of(repeats, lambda: load_table(csv).features.sum())
+
+    table = load_table(csv)
+    if n <= IN_MEMORY_MAX_ROWS:
+        timings.update(in_memory_stages(table, repeats, seed))
+    else:
+        timings.update(blocked_stages(table, repeats, seed))
+    return {stage: n / secs for stage, secs in timings.items()}
+
+
+def in_memory_stages(table, repeats, seed):
+    timings = {}
+    X = np.ascontiguousarray(table.features)
+    price = np.array(table.target)
+    timings['split'] = best_of(repeats, lambda: TrainTestSplit(X).split(price))
+    X_train, _, y_train, _ = TrainTestSplit(X).split(price)
+
+    def fit_stats():
+        stats = SufficientStats.from_arrays(X_train, target_matrix(y_train))
+        return fits_from_stats(stats, ['price', 'log_price'])
+
+    timings['fit_stats'] = best_of(repeats, fit_stats)
+
+    def fit_sklearn():
+        LinearRegression().fit(X_train, y_train)
+        LinearRegression().fit(X_train, np.log(y_train))
+
+    timings['fit_sklearn'] = best_of(repeats, fit_sklearn)
+
+    fits = fit_stats()
+    valuer = BatchValuer(fits['log_price'].coef_, fits['log_price'].intercept_, FEATURES,
+                         X.mean(axis=0))
+    overrides = random_overrides(np.random.default_rng(seed), len(X))
+    timings['valuation'] = best_of(repeats, lambda: valuer.value(overrides))
+    timings['diagnostics'] = best_of(repeats, lambda: diagnose_arrays(fits, X_train, y_train))
+    return timings
+
+
+def blocked_stages(table, repeats, seed, block_rows=BLOCK_ROWS):
+    """The in-memory stages over ``block_rows`` slices of the memory-mapped table."""
+    n = table.n_rows
+    timings = {}
+    timings['split_indices'] = best_of(repeats, lambda: split_indices(n))
+    train = np.ones(n, dtype=bool)
+    train[split_indices(n)[1]] = False
+
+    def train_blocks():
+        for start in range(0, n, block_rows):
+            rows = slice(start, start + block_rows)
+            keep = train[rows]
+            yield (np.asarray(table.features[rows], dtype=np.float64)[keep],
+                   np.asarray(table.target[rows], dtype=np.float64)[keep])
+
+    def fit_stats():
+        stats = SufficientStats(len(FEATURES), 2)
+        for X, price in train_blocks():
+            stats.update(X, target_matrix(price))
+        return fits_from_stats(stats, ['price', 'log_price'])
+
+    timings['fit_stats'] = best_of(repeats, fit_stats)
+
+    fits = fit_stats()
+    valuer = BatchValuer(fits['log_price'].coef_, fits['log_price'].intercept_, FEATURES,
+                         table.features.mean(axis=0))
+    overrides = random_overrides(np.random.default_rng(seed), block_rows)
+
+    def value():
+        for start in range(0, n, block_rows):
+            size = min(block_rows, n - start)
+            valuer.value({k: v[:size] for k, v in overrides.items()})
+
+    def diagnose():
+        diag = ResidualDiagnostics(fits)
+        for X, price in train_blocks():
+            diag.update(X, target_matrix(price, diag.transforms))
+        return diag
+
+    timings['valuation'] = best_of(repeats, value)
+    timings['diagnostics'] = best_of(repeats, diagnose)
+    return timings
+
+
+def compare(results, baseline, tolerance):
+    failures = []
+    for stage, sizes in results.items():
+        for size, rate in sizes.items():
+            before = baseline.get(stage, {}).get(size)
+            if before and rate < before * (1 - tolerance):
+                failures.append(f'{stage} @ {size} rows: {rate:,.0f} rows/s '
+                                f'vs baseline {before:,.0f} ({rate / before - 1:+.0%})')
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=float, nargs='+', default=[1e3, 1e4, 1e5, 1e6])
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path, default=RESULTS / 'latest.json')
+    parser.add_argument('--baseline', type=Path, default=RESULTS / 'baseline.json')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='also store this run as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed drop in rows/sec as a fraction (default: %(default)s)')
+    parser.add_argument('--workdir', help='where to write generated CSVs (default: a temp dir)')
+    args = parser.parse_args(argv)
+
+    generator = BostonGenerator.from_csv()
+    results = {}
+    with tempfile.TemporaryDirectory(dir=args.workdir) as workdir:
+        for size in args.sizes:
+            n = int(size)
+            rates = run_size(n, generator, workdir, args.repeats, args.seed)
+            for stage, rate in rates.items():
+                results.setdefault(stage, {})[str(n)] = rate
+                print(f'{n:>12,} rows  {stage:<16} {rate:16,.0f} rows/s')
+
+    report = {'python': platform.python_version(), 'platform': platform.platform(),
+              'numpy': np.__version__, 'pandas': pd.__version__, 'columns': list(FEATURES) +
+              [TARGET], 'seed': args.seed, 'results': results}
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f'Saved baseline to {args.baseline}')
+        return 0
+
+    if args.baseline.exists():
+        failures = compare(results, json.loads(args.baseline.read_text())['results'],
+                           args.tolerance)
+        for failure in failures:
+            print(f'REGRESSION {failure}')
+        return 1 if failures else 0
+    print(f'No baseline at {args.baseline}; run with --save-baseline to create one')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
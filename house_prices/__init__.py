@@ -0,0 +1,20 @@
+"""Reusable building blocks for the Boston house price valuation model.
+
+The notebook export keeps the exploratory walk-through; this package holds
+the pieces that have to scale past 506 rows.  Importing the package itself
+is deliberately cheap (no pandas, sklearn or plotting libraries) so that
+short-lived workers only pay for the submodules they actually use.
+"""
+
+from pathlib import Path
+
+# Column order of ``data/boston.csv`` (after the unnamed index column).
+FEATURES = ('CRIM', 'ZN', 'INDUS', 'CHAS', 'NOX', 'RM', 'AGE',
+            'DIS', 'RAD', 'TAX', 'PTRATIO', 'B', 'LSTAT')
+TARGET = 'PRICE'
+COLUMNS = FEATURES + (TARGET,)
+
+DATA_PATH = Path(__file__).resolve().parent.parent / 'data' / 'boston.csv'
+
+# Prices in the dataset are quoted in $1000's.
+PRICE_UNIT = 1000
@@ -0,0 +1,248 @@
+"""Binary columnar cache of ``boston.csv`` with memory-mapped loading.
+
+Parsing CSV text is the most expensive step once the data gets large.  The
+first load converts the CSV into a single binary file laid out as::
+
+    magic | header length | JSON header | padding
+    index   int64[n_rows]
+    column  float64[n_rows]   (one contiguous block per column, CRIM..PRICE)
+
+Later loads memory-map that file and hand out NumPy views, so nothing is
+parsed or copied.  The cache is rebuilt when the source changes: a matching
+size and mtime is trusted, otherwise the SHA-256 of the source decides (and
+a match records the new mtime, so a ``touch`` costs one re-hash, not one
+per load)::
+
+    table = load_table('data/boston.csv')
+    X, y = table.features, table.target   # views, no copies
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import DATA_PATH, FEATURES, TARGET
+
+MAGIC = b'HPCOLS01'
+ALIGN = 64
+CACHE_SUFFIX = '.cols'
+
+
+class ColumnarTable:
+    """Read-only view of a columnar cache file.
+
+    ``data`` is a ``(n_columns, n_rows)`` memory map, so every column is
+    contiguous and any subset of consecutive columns is a zero-copy slice.
+    """
+
+    def __init__(self, path, header, index, data):
+        self.path = Path(path)
+        self.header = header
+        self.columns = tuple(header['columns'])
+        self.index = index
+        self.data = data
+        self._positions = {name: i for i, name in enumerate(self.columns)}
+
+    @property
+    def n_rows(self):
+        return self.header['n_rows']
+
+    def column(self, name):
+        """One column as a 1-D view."""
+        return self.data[self._positions[name]]
+
+    __getitem__ = column
+
+    def block(self, names):
+        """``(n_rows, len(names))`` view of consecutive columns ``names``."""
+        positions = [self._positions[name] for name in names]
+        first = positions[0]
+        if positions != list(range(first, first + len(positions))):
+            raise ValueError('block() needs consecutive columns; gather them with column()')
+        return self.data[first:first + len(positions)].T
+
+    @property
+    def features(self):
+        """The 13 feature columns as an ``(n_rows, 13)`` view."""
+        return self.block(FEATURES)
+
+    @property
+    def target(self):
+        """The ``PRICE`` column as a view."""
+        return self.column(TARGET)
+
+    def to_frame(self):
+        """A pandas DataFrame shaped like ``pd.read_csv(path, index_col=0)``."""
+        return pd.DataFrame(self.data.T, index=self.index, columns=list(self.columns))
+
+
+def cache_path_for(source):
+    return Path(source).with_suffix(CACHE_SUFFIX)
+
+
+def file_digest(path, block_bytes=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_bytes), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def count_rows(path, block_bytes=1 << 24):
+    """Upper bound on the data rows of a CSV file with one header line.
+
+    Counts lines, so blank lines (which pandas skips) are included;
+    :func:`build_cache` trims the file to the rows actually parsed.
+    """
+    lines = 0
+    last = b'\n'
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_bytes), b''):
+            lines += block.count(b'\n')
+            last = block[-1:]
+    if last != b'\n':
+        lines += 1
+    return max(lines - 1, 0)
+
+
+def _allocate(path, header, n_columns):
+    """Create ``path`` with ``header`` and return its index and data memmaps."""
+    header_bytes = _encode_header(header)
+    n_rows = header['n_rows']
+    with open(path, 'wb') as f:
+        f.write(header_bytes)
+        f.truncate(len(header_bytes) + 8 * n_rows * (n_columns + 1))
+    if n_rows == 0:
+        return np.empty(0, np.int64), np.empty((n_columns, 0))
+    offset = len(header_bytes)
+    index = np.memmap(path, dtype=np.int64, mode='r+', offset=offset, shape=(n_rows,))
+    data = np.memmap(path, dtype=np.float64, mode='r+', offset=offset + 8 * n_rows,
+                     shape=(n_columns, n_rows))
+    return index, data
+
+
+def build_cache(source=DATA_PATH, cache_path=None, chunksize=1_000_000):
+    """Convert ``source`` to the columnar format and return the opened table."""
+    source = Path(source)
+    cache_path = Path(cache_path) if cache_path else cache_path_for(source)
+    stat = source.stat()
+    n_rows = count_rows(source)
+    columns = list(pd.read_csv(source, index_col=0, nrows=0).columns)
+    header = {
+        'n_rows': n_rows,
+        'columns': columns,
+        'source': str(source),
+        'source_size': stat.st_size,
+        'source_mtime_ns': stat.st_mtime_ns,
+        'source_sha256': file_digest(source),
+    }
+
+    tmp = cache_path.with_name(cache_path.name + '.tmp')
+    trimmed = cache_path.with_name(cache_path.name + '.trim.tmp')
+    try:
+        index, data = _allocate(tmp, header, len(columns))
+        row = 0
+        for chunk in pd.read_csv(source, index_col=0, chunksize=chunksize):
+            end = row + len(chunk)
+            if end > n_rows:
+                raise ValueError(f'{source}: counted at most {n_rows} rows but parsed more')
+            index[row:end] = chunk.index.values
+            data[:, row:end] = chunk.to_numpy(dtype=np.float64).T
+            row = end
+        if row < n_rows:
+            # blank lines were counted; copy the parsed rows into a file of the right size
+            header['n_rows'] = row
+            new_index, new_data = _allocate(trimmed, header, len(columns))
+            new_index[:] = index[:row]
+            for j in range(len(columns)):
+                new_data[j] = data[j, :row]
+            del index, data
+            index, data = new_index, new_data
+            os.replace(trimmed, tmp)
+        if isinstance(index, np.memmap):
+            index.flush()
+            data.flush()
+        del index, data
+        os.replace(tmp, cache_path)
+    finally:
+        for path in (tmp, trimmed):
+            if path.exists():
+                path.unlink()
+    return open_cache(cache_path)
+
+
+def read_header(cache_path):
+    """The JSON header of a cache file and the byte offset of its arrays."""
+    with open(cache_path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f'{cache_path} is not a columnar cache file')
+        length = int.from_bytes(f.read(4), 'little')
+        header = json.loads(f.read(length))
+    return header, _padded(len(MAGIC) + 4 + length)
+
+
+def open_cache(cache_path):
+    """Memory-map an existing cache file."""
+    header, offset = read_header(cache_path)
+    n_rows, n_columns = header['n_rows'], len(header['columns'])
+    if n_rows == 0:
+        return ColumnarTable(cache_path, header, np.empty(0, np.int64),
+                             np.empty((n_columns, 0)))
+    index = np.memmap(cache_path, dtype=np.int64, mode='r', offset=offset, shape=(n_rows,))
+    data = np.memmap(cache_path, dtype=np.float64, mode='r', offset=offset + 8 * n_rows,
+                     shape=(n_columns, n_rows))
+    return ColumnarTable(cache_path, header, index, data)
+
+
+def is_fresh(source, cache_path):
+    """Whether the cache at ``cache_path`` still describes ``source``."""
+    cache_path = Path(cache_path)
+    if not cache_path.exists():
+        return False
+    try:
+        header, offset = read_header(cache_path)
+    except (ValueError, json.JSONDecodeError):
+        return False
+    stat = Path(source).stat()
+    if stat.st_size != header['source_size']:
+        return False
+    if stat.st_mtime_ns == header['source_mtime_ns']:
+        return True
+    if file_digest(source) != header['source_sha256']:
+        return False
+    return _update_mtime(cache_path, header, offset, stat.st_mtime_ns)
+
+
+def _update_mtime(cache_path, header, offset, mtime_ns):
+    """Record a new source mtime in place; False if the header would not fit."""
+    encoded = _encode_header(dict(header, source_mtime_ns=mtime_ns))
+    if len(encoded) != offset:
+        return False
+    try:
+        with open(cache_path, 'r+b') as f:
+            f.write(encoded)
+    except OSError:
+        pass  # read-only cache: still fresh, just re-hashed next time
+    return True
+
+
+def load_table(source=DATA_PATH, cache_path=None):
+    """Open the cache for ``source``, (re)building it first if it is stale."""
+    cache_path = Path(cache_path) if cache_path else cache_path_for(source)
+    if is_fresh(source, cache_path):
+        return open_cache(cache_path)
+    return build_cache(source, cache_path)
+
+
+def _encode_header(header):
+    body = json.dumps(header).encode()
+    prefix = MAGIC + len(body).to_bytes(4, 'little') + body
+    return prefix + b'\0' * (_padded(len(prefix)) - len(prefix))
+
+
+def _padded(n):
+    return -(-n // ALIGN) * ALIGN
@@ -0,0 +1,176 @@
+"""Compact feature storage: float32 features, small integer codes.
+
+Every column of ``boston.csv`` loads as float64 and is then copied into
+``features``, ``X_train`` and ``X_test``.  In compact mode the features are
+stored as float32, except ``CHAS`` (0/1) as uint8 and ``RAD`` (a small
+integer index) as int8 or int16, which roughly halves the memory of every
+copy.  Fits upcast one row block at a time inside the Gram-matrix
+accumulation (:class:`~house_prices.streaming.SufficientStats`), so no full
+float64 copy is ever made::
+
+    data = load_compact('listings.csv')
+    fits = fit_compact(data)
+    fidelity_report(load_data())      # memory saved and drift vs. float64
+
+Usage::
+
+    python -m house_prices.compact [--data data/boston.csv]
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from . import DATA_PATH, FEATURES, TARGET
+from .data import load_data
+from .split import TrainTestSplit
+from .streaming import TARGET_TRANSFORMS, SufficientStats, fits_from_stats, target_matrix
+
+# Columns stored as integer codes; every other feature becomes float32.
+INTEGER_COLUMNS = {'CHAS': (np.uint8,), 'RAD': (np.int8, np.int16)}
+BLOCK_ROWS = 65_536
+
+
+def _integer_dtype(name, values, candidates):
+    finite = values[~np.isnan(values)]
+    if len(finite) < len(values) or np.any(finite != np.round(finite)):
+        raise ValueError(f'{name} must hold whole numbers without nulls to be stored compactly')
+    for dtype in candidates:
+        info = np.iinfo(dtype)
+        if not len(finite) or (finite.min() >= info.min and finite.max() <= info.max):
+            return dtype
+    raise ValueError(f'{name} values do not fit in {np.dtype(candidates[-1]).name}')
+
+
+def compact_dtypes(frame, integer_columns=INTEGER_COLUMNS):
+    """``{column: dtype}`` for the compact layout of ``frame``'s feature columns."""
+    dtypes = {}
+    for name in frame.columns:
+        if name == TARGET:
+            continue
+        if name in integer_columns:
+            values = frame[name].to_numpy(dtype=np.float64)
+            dtypes[name] = _integer_dtype(name, values, integer_columns[name])
+        else:
+            dtypes[name] = np.float32
+    return dtypes
+
+
+def to_compact(frame, dtypes=None):
+    """Copy of ``frame`` with features in the compact layout (``PRICE`` is kept)."""
+    return frame.astype(dtypes or compact_dtypes(frame))
+
+
+def load_compact(path=DATA_PATH, chunksize=1_000_000, dtypes=None):
+    """Read a CSV chunk by chunk, narrowing each chunk before the next is parsed.
+
+    ``dtypes`` fixes the layout up front; by default it is chosen from the
+    first chunk, and a later chunk that does not fit raises ``ValueError``.
+    """
+    chunks = []
+    for chunk in pd.read_csv(path, index_col=0, chunksize=chunksize):
+        if dtypes is None:
+            dtypes = compact_dtypes(chunk)
+        else:
+            for name, dtype in dtypes.items():
+                if np.issubdtype(dtype, np.integer):
+                    _integer_dtype(name, chunk[name].to_numpy(dtype=np.float64), (dtype,))
+        chunks.append(to_compact(chunk, dtypes))
+    if not chunks:
+        raise ValueError(f'{path} has no data rows')
+    return pd.concat(chunks)
+
+
+def compact_stats(X, Y, block_rows=BLOCK_ROWS):
+    """:class:`SufficientStats` of compact ``X``, upcasting one row block at a time."""
+    Y = np.asarray(Y, dtype=np.float64)
+    stats = SufficientStats(X.shape[1], 1 if Y.ndim == 1 else Y.shape[1])
+    for start in range(0, len(X), block_rows):
+        rows = slice(start, start + block_rows)
+        block = (X.iloc[rows].to_numpy(dtype=np.float64) if hasattr(X, 'iloc')
+                 else np.asarray(X[rows], dtype=np.float64))
+        stats.merge(SufficientStats.from_arrays(block, Y[rows]))
+    return stats
+
+
+def fit_compact(data, transforms=TARGET_TRANSFORMS, block_rows=BLOCK_ROWS):
+    """One :class:`~house_prices.streaming.LinearFit` per target, fitted on all rows."""
+    features = list(FEATURES)
+    stats = compact_stats(data[features], target_matrix(data[TARGET].values, transforms),
+                          block_rows)
+    return fits_from_stats(stats, list(transforms), features)
+
+
+def _score(model, X, y):
+    residual = y - model.predict(X)
+    return 1 - residual @ residual / ((y - y.mean()) @ (y - y.mean()))
+
+
+def _nbytes(frame):
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+
+def fidelity_report(data, test_size=0.2, random_state=10):
+    """Memory saved and coefficient/R² drift of compact fits vs. the notebook's.
+
+    Both layouts use the notebook's split.  The float64 side is
+    ``LinearRegression`` on ``PRICE`` (``regression``) and ``log(PRICE)``
+    (``log_regr``); the compact side is :func:`compact_stats` on the compact
+    ``X_train``.  Returns ``(memory, drift)`` DataFrames.
+    """
+    from sklearn.linear_model import LinearRegression
+
+    features = data.drop(TARGET, axis=1)
+    compact = to_compact(features)
+    split = TrainTestSplit(features, test_size, random_state)
+    compact_split = TrainTestSplit(compact, test_size, random_state)
+    memory = pd.DataFrame({
+        'float64_bytes': [_nbytes(features), _nbytes(split.X_train), _nbytes(split.X_test)],
+        'compact_bytes': [_nbytes(compact), _nbytes(compact_split.X_train),
+                          _nbytes(compact_split.X_test)],
+    }, index=['features', 'X_train', 'X_test'])
+    memory.loc['total'] = memory.sum()
+    memory['saved'] = 1 - memory['compact_bytes'] / memory['float64_bytes']
+
+    X_train, X_test = split.X_train.to_numpy(), split.X_test.to_numpy()
+    compact_train = compact_split.X_train.to_numpy(dtype=np.float64)
+    compact_test = compact_split.X_test.to_numpy(dtype=np.float64)
+    targets = {'regression': data[TARGET], 'log_regr': np.log(data[TARGET])}
+    rows = {}
+    for name, target in targets.items():
+        y_train, y_test = (y.to_numpy() for y in split.targets(target))
+        reference = LinearRegression().fit(X_train, y_train)
+        fit = fits_from_stats(compact_stats(compact_split.X_train, y_train),
+                              [name], list(features.columns))[name]
+        drift = np.abs(fit.coef_ - reference.coef_)
+        train_r2 = reference.score(X_train, y_train)
+        test_r2 = reference.score(X_test, y_test)
+        rows[name] = {
+            'max_coef_drift': drift.max(),
+            'max_rel_coef_drift': (drift / np.abs(reference.coef_)).max(),
+            'intercept_drift': abs(fit.intercept_ - reference.intercept_),
+            'train_r2': train_r2,
+            'train_r2_drift': _score(fit, compact_train, y_train) - train_r2,
+            'test_r2': test_r2,
+            'test_r2_drift': _score(fit, compact_test, y_test) - test_r2,
+        }
+    return memory, pd.DataFrame(rows).T
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default=DATA_PATH, help='CSV to check (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    data = load_data(args.data)
+    memory, drift = fidelity_report(data)
+    print('Compact dtypes:', {k: np.dtype(v).name for k, v in compact_dtypes(data).items()
+                              if np.dtype(v) != np.float32}, 'others float32')
+    print(memory.to_string(formatters={'saved': '{:.1%}'.format}))
+    print()
+    print(drift.to_string(float_format='{:.3g}'.format))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""Cross-validation and model selection from cached per-fold statistics.
+
+The notebook judges its models on one ``random_state=10`` split.  Naive
+k-fold CV over many candidates refits ``LinearRegression`` once per fold
+and per candidate.  :class:`CrossValidator` instead computes the
+:class:`SufficientStats` of every fold once (on a process pool) and
+derives everything else from them:
+
+* the training statistics of fold ``i`` are ``total - fold[i]``;
+* any feature subset is a sub-block of those Gram matrices;
+* the held-out SSE of any coefficients is a quadratic form in the held-out
+  fold's statistics, so scoring never touches the rows again.
+
+::
+
+    cv = CrossValidator(features.values, target.values, k=5, repeats=3)
+    cv.leaderboard(drop_one_candidates())
+
+Scores are out-of-sample R² in each candidate's own target space (log R²
+for the log model), as ``log_regr.score(X_test, log_y_test)`` reports.
+Folds follow ``KFold(n_splits=k, shuffle=True, random_state=seed)``.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from . import FEATURES
+from .streaming import SufficientStats, TARGET_TRANSFORMS, target_matrix
+
+_shared = {}
+
+
+def kfold_indices(n_samples, k=5, random_state=None):
+    """Test indices of each fold, in the order ``KFold(shuffle=True)`` yields them."""
+    if not 2 <= k <= n_samples:
+        raise ValueError(f'k must be between 2 and the number of rows, got {k}')
+    indices = np.arange(n_samples)
+    np.random.RandomState(random_state).shuffle(indices)
+    sizes = np.full(k, n_samples // k)
+    sizes[:n_samples % k] += 1
+    return np.split(indices, np.cumsum(sizes)[:-1])
+
+
+def drop_one_candidates(feature_names=FEATURES, transforms=TARGET_TRANSFORMS):
+    """Every target with all features and with each single feature dropped."""
+    out = []
+    for target in transforms:
+        out.append((target, tuple(feature_names)))
+        for drop in feature_names:
+            out.append((target, tuple(f for f in feature_names if f != drop)))
+    return out
+
+
+def heldout_sse(test, coef, intercept, cols, target):
+    """SSE on the rows summarised by ``test`` for coefficients on ``cols``."""
+    b = coef
+    bias = test.mean_y[target] - intercept - test.mean_x[cols] @ b
+    return (test.syy[target] - 2 * b @ test.sxy[cols, target]
+            + b @ test.sxx[np.ix_(cols, cols)] @ b + test.n * bias * bias)
+
+
+def solve_subset(train, cols, target):
+    """Least squares ``(coef, intercept)`` on a subset of feature positions."""
+    sxx = train.sxx[np.ix_(cols, cols)]
+    sxy = train.sxy[cols, target]
+    try:
+        coef = np.linalg.solve(sxx, sxy)
+    except np.linalg.LinAlgError:
+        coef = np.linalg.lstsq(sxx, sxy, rcond=None)[0]
+    return coef, train.mean_y[target] - train.mean_x[cols] @ coef
+
+
+def _init_worker(X, Y):
+    _shared['X'], _shared['Y'] = X, Y
+
+
+def _fold_stats(indices):
+    return SufficientStats.from_arrays(_shared['X'][indices], _shared['Y'][indices])
+
+
+class CrossValidator:
+    """Repeated k-fold CV of linear candidates over shared fold statistics."""
+
+    def __init__(self, X, price, feature_names=FEATURES, transforms=TARGET_TRANSFORMS,
+                 k=5, repeats=1, random_state=0, workers=None):
+        self.feature_names = tuple(feature_names)
+        self.target_names = tuple(transforms)
+        self.k = k
+        X = np.asarray(X, dtype=np.float64)
+        Y = target_matrix(price, transforms)
+        seeds = np.random.RandomState(random_state).randint(2**31 - 1, size=repeats)
+        folds = [kfold_indices(len(X), k, seed) for seed in seeds]
+        tasks = [idx for repeat in folds for idx in repeat]
+
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            _init_worker(X, Y)
+            try:
+                stats = [_fold_stats(idx) for idx in tasks]
+            finally:
+                _shared.clear()
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                     initargs=(X, Y)) as pool:
+                stats = list(pool.map(_fold_stats, tasks))
+        # fold_stats[r][i] summarises the held-out rows of fold i in repeat r.
+        self.fold_stats = [stats[r * k:(r + 1) * k] for r in range(repeats)]
+        self.totals = []
+        for repeat in self.fold_stats:
+            total = SufficientStats(len(self.feature_names), len(self.target_names))
+            for fold in repeat:
+                total.merge(fold)
+            self.totals.append(total)
+
+    def scores(self, target, features):
+        """Out-of-sample R² of one candidate for every (repeat, fold)."""
+        t = self.target_names.index(target)
+        cols = np.array([self.feature_names.index(f) for f in features], dtype=np.intp)
+        out = np.empty((len(self.fold_stats), self.k))
+        for r, (total, repeat) in enumerate(zip(self.totals, self.fold_stats)):
+            for i, test in enumerate(repeat):
+                coef, intercept = solve_subset(total - test, cols, t)
+                out[r, i] = 1 - heldout_sse(test, coef, intercept, cols, t) / test.syy[t]
+        return out
+
+    def leaderboard(self, candidates):
+        """Mean and spread of out-of-sample R² per ``(target, features)`` candidate."""
+        rows = []
+        for target, features in candidates:
+            scores = self.scores(target, features)
+            dropped = [f for f in self.feature_names if f not in features]
+            rows.append({'target': target,
+                         'dropped': ', '.join(dropped) or '-',
+                         'n_features': len(features),
+                         'mean_r2': scores.mean(),
+                         'std_r2': scores.std(ddof=1) if scores.size > 1 else np.nan,
+                         'min_r2': scores.min()})
+        board = pd.DataFrame(rows).sort_values('mean_r2', ascending=False)
+        return board.reset_index(drop=True)
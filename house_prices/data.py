@@ -0,0 +1,15 @@
+"""Loading ``boston.csv`` the same way the notebook does."""
+
+import pandas as pd
+
+from . import DATA_PATH, TARGET
+
+
+def load_data(path=DATA_PATH):
+    """Read the dataset; the first column only holds row numbers."""
+    return pd.read_csv(path, index_col=0)
+
+
+def split_features(data):
+    """Return ``(features, target)`` as in ``data.drop('PRICE', axis=1)``."""
+    return data.drop(TARGET, axis=1), data[TARGET]
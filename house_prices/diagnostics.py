@@ -0,0 +1,241 @@
+"""Single-pass residual diagnostics for several models at once.
+
+The notebook materialises ``predicted_vals``, ``residuals`` and
+``log_residuals`` as full-length Series before calling ``.mean()`` and
+``.skew()``.  :class:`ResidualDiagnostics` walks the data in chunks instead
+and keeps, per model, running central moments of the residuals (merged with
+Pébay's pairwise formulas), the sums needed for R² and MSE, and a
+fixed-bin residual histogram.  Memory stays constant in the row count::
+
+    diag = ResidualDiagnostics({'price': regression, 'log_price': log_regr},
+                               bins={'price': (-20, 30, 50), 'log_price': (-1, 1, 50)})
+    for chunk in pd.read_csv(path, index_col=0, chunksize=1_000_000):
+        diag.update_frame(chunk)
+    diag.summary()            # mean, std, skew, kurtosis, rsquared, mse per model
+    diag.displot('log_price', kde=True, color='green')
+
+Skew and kurtosis use the same bias-corrected estimators as pandas'
+``Series.skew()`` and ``Series.kurt()``.  Each model leaves out the rows
+whose residual or target is not finite for it (a null feature or ``PRICE``,
+or, for a log model only, a non-positive price), as pandas skips NaN, and
+counts them in its own ``summary()[name]['dropped']``.
+"""
+
+import numpy as np
+
+from . import FEATURES, TARGET
+from .streaming import TARGET_TRANSFORMS, _as_2d, target_matrix
+
+
+class RunningMoments:
+    """Count, mean and central moment sums ``M2..M4`` for ``k`` series in parallel.
+
+    The series share one count.  Values must be finite; NaN propagates into
+    every moment, so callers drop incomplete rows first (see
+    :meth:`ResidualDiagnostics.update`).
+    """
+
+    def __init__(self, k):
+        self.n = 0
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.m3 = np.zeros(k)
+        self.m4 = np.zeros(k)
+
+    @classmethod
+    def from_array(cls, values):
+        values = _as_2d(values)
+        moments = cls(values.shape[1])
+        if len(values):
+            moments.n = len(values)
+            moments.mean = values.mean(axis=0)
+            d = values - moments.mean
+            d2 = d * d
+            moments.m2 = d2.sum(axis=0)
+            moments.m3 = (d2 * d).sum(axis=0)
+            moments.m4 = (d2 * d2).sum(axis=0)
+        return moments
+
+    def merge(self, other):
+        """Combine with the moments of disjoint rows, in place."""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean = other.n, other.mean.copy()
+            self.m2, self.m3, self.m4 = other.m2.copy(), other.m3.copy(), other.m4.copy()
+            return self
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = other.mean - self.mean
+        d2 = delta * delta
+        m4 = (self.m4 + other.m4
+              + d2 * d2 * na * nb * (na * na - na * nb + nb * nb) / n**3
+              + 6 * d2 * (na * na * other.m2 + nb * nb * self.m2) / n**2
+              + 4 * delta * (na * other.m3 - nb * self.m3) / n)
+        m3 = (self.m3 + other.m3
+              + d2 * delta * na * nb * (na - nb) / n**2
+              + 3 * delta * (na * other.m2 - nb * self.m2) / n)
+        self.m2 = self.m2 + other.m2 + d2 * na * nb / n
+        self.m3, self.m4 = m3, m4
+        self.mean = self.mean + delta * nb / n
+        self.n = n
+        return self
+
+    def var(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else np.full_like(self.m2, np.nan)
+
+    def skew(self):
+        """Adjusted Fisher-Pearson skewness, as ``pandas.Series.skew``."""
+        n = self.n
+        if n < 3:
+            return np.full_like(self.m2, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            g1 = np.sqrt(n) * self.m3 / self.m2**1.5
+        return np.where(self.m2 > 0, g1 * np.sqrt(n * (n - 1)) / (n - 2), 0.0)
+
+    def kurtosis(self):
+        """Bias-corrected excess kurtosis, as ``pandas.Series.kurt``."""
+        n = self.n
+        if n < 4:
+            return np.full_like(self.m2, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            g2 = (n + 1) * n * (n - 1) * self.m4 / ((n - 2) * (n - 3) * self.m2**2)
+        adj = 3 * (n - 1)**2 / ((n - 2) * (n - 3))
+        return np.where(self.m2 > 0, g2 - adj, 0.0)
+
+
+class FixedHistogram:
+    """Counts over fixed, equal-width bins with under- and overflow buckets.
+
+    ``±inf`` land in the under/overflow buckets; NaN is counted separately
+    in ``nan``.
+    """
+
+    def __init__(self, low, high, bins):
+        self.edges = np.linspace(low, high, bins + 1)
+        self.counts = np.zeros(bins + 2, dtype=np.int64)  # [under, *bins, over]
+        self.nan = 0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        missing = np.isnan(values)
+        if missing.any():
+            self.nan += int(np.count_nonzero(missing))
+            values = values[~missing]
+        low, high = self.edges[0], self.edges[-1]
+        bins = len(self.edges) - 1
+        idx = np.floor((values - low) * (bins / (high - low)))
+        idx = np.clip(idx, -1, bins).astype(np.intp) + 1
+        idx[values == high] = bins  # include the right edge like np.histogram
+        self.counts += np.bincount(idx, minlength=bins + 2)
+
+    def merge(self, other):
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError('Cannot merge histograms with different bins')
+        self.counts += other.counts
+        self.nan += other.nan
+        return self
+
+    @property
+    def centres(self):
+        return (self.edges[:-1] + self.edges[1:]) / 2
+
+    @property
+    def inside(self):
+        """Counts of the regular bins, without under- and overflow."""
+        return self.counts[1:-1]
+
+
+class ResidualDiagnostics:
+    """Residual moments, R², MSE and histograms for several linear models.
+
+    ``models`` maps names to fitted models exposing ``coef_`` and
+    ``intercept_`` (``LinearRegression`` or ``LinearFit``); ``transforms``
+    maps the same names to the target transform each model was fitted on.
+    ``bins`` optionally maps a name to ``(low, high, n_bins)``.
+    """
+
+    def __init__(self, models, transforms=None, bins=None):
+        self.names = tuple(models)
+        transforms = transforms or TARGET_TRANSFORMS
+        self.transforms = {name: transforms[name] for name in self.names}
+        self.coef = np.column_stack([np.ravel(m.coef_) for m in models.values()])
+        self.intercept = np.array([float(m.intercept_) for m in models.values()])
+        # One RunningMoments per model: each drops its own non-finite rows.
+        self.residuals = [RunningMoments(1) for _ in self.names]
+        self.targets = [RunningMoments(1) for _ in self.names]
+        self.sse = np.zeros(len(self.names))
+        self.dropped = np.zeros(len(self.names), dtype=np.int64)
+        self.histograms = {name: FixedHistogram(*spec) for name, spec in (bins or {}).items()}
+
+    def update(self, X, Y):
+        """Fold in a chunk of features ``X`` and transformed targets ``Y``."""
+        X, Y = _as_2d(X), _as_2d(Y)
+        residuals = Y - (X @ self.coef + self.intercept)
+        finite = np.isfinite(residuals) & np.isfinite(Y)
+        for j, name in enumerate(self.names):
+            r, y = residuals[:, j], Y[:, j]
+            if not finite[:, j].all():
+                self.dropped[j] += np.count_nonzero(~finite[:, j])
+                r, y = r[finite[:, j]], y[finite[:, j]]
+            self.residuals[j].merge(RunningMoments.from_array(r))
+            self.targets[j].merge(RunningMoments.from_array(y))
+            self.sse[j] += r @ r
+            if name in self.histograms:
+                self.histograms[name].update(r)
+        return self
+
+    def update_frame(self, frame):
+        """Fold in a DataFrame chunk with the ``boston.csv`` columns."""
+        X = frame[list(FEATURES)].to_numpy(dtype=np.float64)
+        return self.update(X, target_matrix(frame[TARGET].values, self.transforms))
+
+    def merge(self, other):
+        """Combine with diagnostics of the same models over disjoint rows."""
+        for mine, theirs in zip(self.residuals + self.targets, other.residuals + other.targets):
+            mine.merge(theirs)
+        self.sse += other.sse
+        self.dropped += other.dropped
+        for name, hist in self.histograms.items():
+            hist.merge(other.histograms[name])
+        return self
+
+    def summary(self):
+        """Per-model ``{n, dropped, mean, std, skew, kurtosis, rsquared, mse}``."""
+        summary = {}
+        for j, name in enumerate(self.names):
+            r, sse = self.residuals[j], self.sse[j]
+            summary[name] = {
+                'n': r.n,
+                'dropped': int(self.dropped[j]),
+                'mean': float(r.mean[0]),
+                'std': float(np.sqrt(r.var()[0])),
+                'skew': float(r.skew()[0]),
+                'kurtosis': float(r.kurtosis()[0]),
+                'rsquared': float(1 - sse / self.targets[j].m2[0]),
+                'mse': float(sse / r.n) if r.n else np.nan,
+            }
+        return summary
+
+    def displot(self, name, **kwargs):
+        """Draw the residual histogram of ``name`` with ``sns.displot``.
+
+        Seaborn receives one weighted point per bin, so drawing costs the
+        same for a thousand rows as for a billion.
+        """
+        import seaborn as sns
+
+        hist = self.histograms[name]
+        return sns.displot(x=hist.centres, weights=hist.inside, bins=len(hist.centres),
+                           binrange=(hist.edges[0], hist.edges[-1]), **kwargs)
+
+
+def diagnose_arrays(models, X, price, chunk_rows=1_000_000, transforms=None, bins=None):
+    """Run :class:`ResidualDiagnostics` over in-memory arrays chunk by chunk."""
+    diag = ResidualDiagnostics(models, transforms, bins)
+    X = _as_2d(X)
+    price = np.asarray(price, dtype=np.float64)
+    for start in range(0, len(X), chunk_rows):
+        stop = start + chunk_rows
+        diag.update(X[start:stop], target_matrix(price[start:stop], diag.transforms))
+    return diag
@@ -0,0 +1,56 @@
+"""Fit the notebook's log-price model and export it for serving.
+
+Usage::
+
+    python -m house_prices.export log_model.npz [--data data/boston.csv]
+
+The model is fitted exactly like ``log_regr`` in the notebook: 80/20 split
+with ``random_state=10`` and ``np.log(data['PRICE'])`` as the target.  The
+baseline is ``features.mean()`` over the whole dataset, and a quantile table
+of every feature (:class:`~house_prices.sketch.QuantileTable`) is saved with
+it.
+"""
+
+import argparse
+
+import numpy as np
+
+from . import DATA_PATH
+from .data import load_data, split_features
+from .predictor import save_model
+from .sketch import QuantileTable
+from .split import TrainTestSplit
+from .valuation import BatchValuer
+
+
+def fit_log_model(data):
+    """Return the fitted ``log_regr`` and the ``features`` frame it was built from."""
+    from sklearn.linear_model import LinearRegression
+
+    features, target = split_features(data)
+    X_train, _, log_y_train, _ = TrainTestSplit(features).split(np.log(target))
+    log_regr = LinearRegression()
+    log_regr.fit(X_train, log_y_train)
+    return log_regr, features
+
+
+def export_model(model, features, path):
+    """Save a fitted log-price ``model`` with the ``features.mean()`` baseline."""
+    valuer = BatchValuer.from_model(model, features, QuantileTable.from_frame(features))
+    save_model(path, valuer)
+    return valuer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export the fitted log-price model.')
+    parser.add_argument('output', help='path of the .npz artifact to write')
+    parser.add_argument('--data', default=DATA_PATH, help='CSV to fit on (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    log_regr, features = fit_log_model(load_data(args.data))
+    valuer = export_model(log_regr, features, args.output)
+    print(f'Wrote model {valuer.version} to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
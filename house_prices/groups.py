@@ -0,0 +1,384 @@
+"""Grouped descriptive statistics for many group keys in one pass.
+
+The descriptive section asks ``data.PTRATIO.mean()``, ``data.describe()``
+and ``data.CHAS.value_counts()`` over the whole table; grouping the same
+questions by ``CHAS``, by ``RAD`` bucket and by binned ``DIS``/``LSTAT``
+with chained ``groupby`` calls rescans the data once per key.
+:class:`GroupedAggregator` reads each chunk once and, for every key, turns
+the rows into integer group codes, sorts them once so each group is a
+contiguous slice of every column, and reduces all columns of a group
+together: count, mean, centred squares, min, max, and optionally one
+:class:`~house_prices.sketch.QuantileSketch` per group and column.
+Chunk statistics merge with the pairwise update of Chan et al., so chunks
+and workers can be combined::
+
+    groups = group_csv('listings.csv')      # DEFAULT_KEYS, cached
+    groups['CHAS'].stat('mean')             # one row per group, 14 columns
+    groups['RAD'].describe('PRICE')         # like groupby(...).PRICE.describe()
+    groups['LSTAT'].value_counts()
+
+Results are cached per source file (size and mtime) and key set, and every
+table derived from a :class:`GroupStats` is memoized, so repeated queries
+are dictionary lookups.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import DATA_PATH
+from .sketch import DEFAULT_K, QuantileSketch
+
+SKETCH_K = DEFAULT_K
+
+
+class Values:
+    """Group by the distinct values of ``column`` (e.g. ``CHAS``)."""
+
+    def __init__(self, column, name=None):
+        self.column = column
+        self.name = name or column
+        self._ids = {}
+        self.labels = []
+
+    def spec(self):
+        return ('values', self.column, self.name)
+
+    def codes(self, values):
+        """Group code per row (``-1`` for NaN keys); new values get new codes."""
+        inverse, uniques = pd.factorize(values)
+        local = np.array([self._ids.setdefault(u, len(self._ids)) for u in uniques.tolist()]
+                         + [-1], dtype=np.int64)
+        for value, code in self._ids.items():
+            if code >= len(self.labels):
+                self.labels.append(value)
+        return local[inverse]
+
+    @property
+    def n_groups(self):
+        return len(self.labels)
+
+    def order(self):
+        """Group codes in label order."""
+        return np.argsort(self.labels, kind='stable')
+
+
+class Bins:
+    """Group by right-closed intervals of ``column`` between ``edges``, as ``pd.cut``."""
+
+    def __init__(self, column, edges, name=None):
+        self.column = column
+        self.name = name or column
+        self.edges = np.asarray(edges, dtype=np.float64)
+        if len(self.edges) < 2 or np.any(np.diff(self.edges) <= 0):
+            raise ValueError('edges must be strictly increasing with at least two values')
+        self.labels = [f'({lo:g}, {hi:g}]' for lo, hi in zip(self.edges[:-1], self.edges[1:])]
+
+    def spec(self):
+        return ('bins', self.column, self.name, tuple(self.edges.tolist()))
+
+    def codes(self, values):
+        """Interval code per row; ``-1`` outside the edges or for NaN."""
+        codes = np.searchsorted(self.edges, values, side='left') - 1
+        codes[(codes < 0) | (codes >= self.n_groups) | np.isnan(values)] = -1
+        return codes
+
+    @property
+    def n_groups(self):
+        return len(self.labels)
+
+    def order(self):
+        return np.arange(self.n_groups)
+
+
+DEFAULT_KEYS = (
+    Values('CHAS'),
+    Bins('RAD', [0, 4, 8, 24]),
+    Bins('DIS', [0, 2, 4, 6, 8, np.inf]),
+    Bins('LSTAT', [0, 5, 10, 15, 20, np.inf]),
+)
+
+
+def _code_dtype(n_groups):
+    return np.uint8 if n_groups <= 1 << 8 else np.uint16 if n_groups <= 1 << 16 else np.int64
+
+
+class _KeyAccumulator:
+    """Running per-group statistics of every column for one key."""
+
+    def __init__(self, key, n_columns, sketch_k):
+        self.key = key
+        self.c = n_columns
+        self.sketch_k = sketch_k
+        self.size = np.zeros(0, dtype=np.int64)
+        self.count = np.zeros((0, n_columns), dtype=np.int64)
+        self.mean = np.zeros((0, n_columns))
+        self.m2 = np.zeros((0, n_columns))
+        self.min = np.zeros((0, n_columns))
+        self.max = np.zeros((0, n_columns))
+        self.sketches = []
+
+    def _grow(self, g):
+        extra = g - len(self.size)
+        if extra <= 0:
+            return
+        c = self.c
+        self.size = np.concatenate([self.size, np.zeros(extra, dtype=np.int64)])
+        self.count = np.vstack([self.count, np.zeros((extra, c), dtype=np.int64)])
+        self.mean = np.vstack([self.mean, np.zeros((extra, c))])
+        self.m2 = np.vstack([self.m2, np.zeros((extra, c))])
+        self.min = np.vstack([self.min, np.full((extra, c), np.inf)])
+        self.max = np.vstack([self.max, np.full((extra, c), -np.inf)])
+        if self.sketch_k:
+            self.sketches += [[QuantileSketch(self.sketch_k, seed=len(self.sketches) * c + j)
+                               for j in range(c)] for _ in range(extra)]
+
+    def update(self, codes, XT):
+        """Add rows with group ``codes``; ``XT`` holds the columns as rows ``(c, n)``.
+
+        Rows are sorted by code once, after which every group is a contiguous
+        slice and each statistic is a plain reduction over it.
+        """
+        keep = codes >= 0
+        if not keep.all():
+            codes, XT = codes[keep], XT[:, keep]
+        g = self.key.n_groups
+        self._grow(g)
+        if not len(codes):
+            return
+        # small integer codes take NumPy's radix sort
+        order = np.argsort(codes.astype(_code_dtype(g)), kind='stable')
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        ends = np.r_[starts[1:], len(sorted_codes)]
+        grouped = XT[:, order]
+        nan = np.isnan(grouped)
+        has_nan = nan.any()
+
+        size = np.zeros(g, dtype=np.int64)
+        count = np.zeros((g, self.c), dtype=np.int64)
+        mean = np.zeros((g, self.c))
+        m2 = np.zeros((g, self.c))
+        for code, start, end in zip(sorted_codes[starts], starts, ends):
+            rows = grouped[:, start:end]
+            size[code] = end - start
+            if has_nan:
+                missing = nan[:, start:end]
+                count[code] = size[code] - missing.sum(axis=1)
+                mean[code] = np.where(missing, 0.0, rows).sum(axis=1) / np.maximum(count[code], 1)
+                centred = np.where(missing, 0.0, rows - mean[code][:, None])
+                self.min[code] = np.fmin(self.min[code], np.fmin.reduce(rows, axis=1))
+                self.max[code] = np.fmax(self.max[code], np.fmax.reduce(rows, axis=1))
+            else:
+                count[code] = size[code]
+                mean[code] = rows.mean(axis=1)
+                centred = rows - mean[code][:, None]
+                self.min[code] = np.minimum(self.min[code], rows.min(axis=1))
+                self.max[code] = np.maximum(self.max[code], rows.max(axis=1))
+            m2[code] = np.einsum('ij,ij->i', centred, centred)
+            if self.sketch_k:
+                for j, sketch in enumerate(self.sketches[code]):
+                    sketch.update(rows[j])
+
+        self.size += size
+        self._merge_moments(count, mean, m2)
+
+    def _merge_moments(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        zeros = np.zeros(total.shape)
+        self.m2 += m2 + delta**2 * np.divide(self.count * count, total, out=zeros.copy(),
+                                             where=total > 0)
+        self.mean += np.divide(delta * count, total, out=zeros, where=total > 0)
+        self.count = total
+
+    def merge(self, other):
+        """Fold in another accumulator over the same key (codes must agree)."""
+        self._grow(len(other.size))
+        g = len(other.size)
+        self.size[:g] += other.size
+        count = np.zeros_like(self.count)
+        mean = np.zeros_like(self.mean)
+        m2 = np.zeros_like(self.m2)
+        count[:g], mean[:g], m2[:g] = other.count, other.mean, other.m2
+        self._merge_moments(count, mean, m2)
+        self.min[:g] = np.minimum(self.min[:g], other.min)
+        self.max[:g] = np.maximum(self.max[:g], other.max)
+        for mine, theirs in zip(self.sketches, other.sketches):
+            for a, b in zip(mine, theirs):
+                a.merge(b)
+        return self
+
+
+class GroupStats:
+    """Per-group statistics of every column for one key.
+
+    Tables have one row per group (in label order) and one column per data
+    column; each is built once and then served from ``self._tables``.
+    """
+
+    STATS = ('count', 'mean', 'std', 'var', 'min', 'max')
+
+    def __init__(self, key, columns, size, count, mean, m2, low, high, sketches):
+        order = key.order()
+        self.key = key
+        self.columns = list(columns)
+        self.labels = [key.labels[i] for i in order]
+        self.size = size[order]
+        self.count = count[order]
+        self.mean = np.where(self.count > 0, mean[order], np.nan)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.var = m2[order] / (self.count - 1)
+        self.min = np.where(self.count > 0, low[order], np.nan)
+        self.max = np.where(self.count > 0, high[order], np.nan)
+        self.sketches = [sketches[i] for i in order] if sketches else None
+        self._tables = {}
+
+    def _table(self, values):
+        index = pd.Index(self.labels, name=self.key.name)
+        return pd.DataFrame(values, index=index, columns=self.columns)
+
+    def stat(self, name):
+        """``count``, ``mean``, ``std``, ``var``, ``min`` or ``max`` as a DataFrame."""
+        if name not in self.STATS:
+            raise ValueError(f'stat must be one of {self.STATS}, not {name!r}')
+        if name not in self._tables:
+            values = np.sqrt(self.var) if name == 'std' else getattr(self, name)
+            self._tables[name] = self._table(values)
+        return self._tables[name]
+
+    def quantile(self, q):
+        """Approximate ``q``-quantile of every group and column (needs sketches)."""
+        if self.sketches is None:
+            raise ValueError('quantiles need an aggregator built with sketch_k')
+        name = ('quantile', float(q))
+        if name not in self._tables:
+            values = [[s.quantile(q) if s.n else np.nan for s in row] for row in self.sketches]
+            self._tables[name] = self._table(values)
+        return self._tables[name]
+
+    def value_counts(self):
+        """Rows per group, as ``value_counts().sort_index()``."""
+        return pd.Series(self.size, index=pd.Index(self.labels, name=self.key.name),
+                         name='count')
+
+    def describe(self, column):
+        """``groupby(key)[column].describe()`` with sketch quartiles when available."""
+        name = ('describe', column)
+        if name not in self._tables:
+            j = self.columns.index(column)
+            table = {'count': self.count[:, j].astype(np.float64), 'mean': self.mean[:, j],
+                     'std': np.sqrt(self.var[:, j]), 'min': self.min[:, j]}
+            if self.sketches is not None:
+                for q in (0.25, 0.5, 0.75):
+                    table[f'{q:.0%}'] = self.quantile(q)[column].to_numpy()
+            table['max'] = self.max[:, j]
+            self._tables[name] = pd.DataFrame(table, index=pd.Index(self.labels,
+                                                                     name=self.key.name))
+        return self._tables[name]
+
+
+class GroupedAggregator:
+    """Accumulate grouped statistics of ``columns`` for every key in ``keys``.
+
+    ``sketch_k`` sets the size of the per-group quantile sketches; ``None``
+    skips them (count/mean/var/min/max only).
+    """
+
+    def __init__(self, columns, keys=DEFAULT_KEYS, sketch_k=SKETCH_K):
+        self.columns = list(columns)
+        self.keys = [_fresh(key) for key in keys]
+        names = [key.name for key in self.keys]
+        if len(set(names)) != len(names):
+            raise ValueError(f'group key names must be unique: {names}')
+        self._positions = {key.name: self.columns.index(key.column) for key in self.keys}
+        self._accumulators = [_KeyAccumulator(key, len(self.columns), sketch_k)
+                              for key in self.keys]
+        self.rows = 0
+
+    def update(self, block):
+        """Add a DataFrame chunk with ``self.columns`` (or an array in that order)."""
+        if hasattr(block, 'columns'):
+            block = block[self.columns].to_numpy(dtype=np.float64)
+        XT = np.ascontiguousarray(np.asarray(block, dtype=np.float64).T)
+        self.rows += XT.shape[1]
+        for key, acc in zip(self.keys, self._accumulators):
+            acc.update(key.codes(XT[self._positions[key.name]]), XT)
+        return self
+
+    def merge(self, other):
+        """Fold in an aggregator over other rows; ``Values`` keys are re-coded to match."""
+        for key, acc, their_key, theirs in zip(self.keys, self._accumulators,
+                                               other.keys, other._accumulators):
+            if isinstance(key, Values):
+                theirs = _recode(theirs, their_key, key)
+            acc.merge(theirs)
+        self.rows += other.rows
+        return self
+
+    def result(self):
+        """``{key name: GroupStats}``."""
+        return {key.name: GroupStats(key, self.columns, acc.size, acc.count, acc.mean, acc.m2,
+                                     acc.min, acc.max, acc.sketches)
+                for key, acc in zip(self.keys, self._accumulators)}
+
+
+def _fresh(key):
+    """A copy of ``key`` without learned state, so keys can be shared safely."""
+    if isinstance(key, Values):
+        return Values(key.column, key.name)
+    return Bins(key.column, key.edges, key.name)
+
+
+def _recode(acc, their_key, key):
+    """Re-index ``acc`` (coded by ``their_key``) onto ``key``'s codes."""
+    mapping = key.codes(np.asarray(their_key.labels, dtype=np.float64))
+    recoded = _KeyAccumulator(key, acc.c, acc.sketch_k)
+    recoded._grow(key.n_groups)
+    recoded.size[mapping] = acc.size
+    recoded.count[mapping] = acc.count
+    recoded.mean[mapping] = acc.mean
+    recoded.m2[mapping] = acc.m2
+    recoded.min[mapping] = acc.min
+    recoded.max[mapping] = acc.max
+    if acc.sketches:
+        for code, row in zip(mapping, acc.sketches):
+            recoded.sketches[code] = row
+    return recoded
+
+
+_CACHE = {}
+
+
+def _cache_key(source, keys, sketch_k, chunksize):
+    stat = os.stat(source)
+    return (os.path.abspath(source), stat.st_size, stat.st_mtime_ns,
+            tuple(key.spec() for key in keys), sketch_k, chunksize)
+
+
+def group_frame(data, keys=DEFAULT_KEYS, sketch_k=SKETCH_K, chunk_rows=1_000_000):
+    """Grouped statistics of an in-memory DataFrame (not cached)."""
+    aggregator = GroupedAggregator(data.columns, keys, sketch_k)
+    for start in range(0, len(data), chunk_rows):
+        aggregator.update(data.iloc[start:start + chunk_rows])
+    return aggregator.result()
+
+
+def group_csv(path=DATA_PATH, keys=DEFAULT_KEYS, sketch_k=SKETCH_K, chunksize=1_000_000):
+    """Grouped statistics of a CSV in one streaming pass, cached until the file changes."""
+    cache_key = _cache_key(path, keys, sketch_k, chunksize)
+    if cache_key not in _CACHE:
+        aggregator = None
+        for chunk in pd.read_csv(path, index_col=0, chunksize=chunksize):
+            if aggregator is None:
+                aggregator = GroupedAggregator(chunk.columns, keys, sketch_k)
+            aggregator.update(chunk)
+        if aggregator is None:
+            raise ValueError(f'{path} has no data rows')
+        _CACHE[cache_key] = aggregator.result()
+    return _CACHE[cache_key]
+
+
+def clear_cache():
+    _CACHE.clear()
@@ -0,0 +1,122 @@
+"""Bounded LRU/TTL cache in front of property valuations.
+
+Screening tools keep re-valuing the same configurations.  A
+:class:`ValuationCache` keys each property on its full feature vector (the
+baseline with the overrides applied) rounded to ``decimals`` places, so
+``{}`` and ``{'RM': <average RM>}`` share an entry, and on the model
+version, so a retrained model never serves stale prices::
+
+    cache = ValuationCache(valuer, maxsize=100_000, ttl=3600)
+    cache.value({'RM': 8, 'PTRATIO': 20, 'CHAS': 1})
+    cache.value_many(specs)       # misses are priced in one batch
+    cache.set_model(new_valuer)   # drops entries of the old model
+    cache.stats()                 # hits, misses, evictions, expirations
+"""
+
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+class ValuationCache:
+    """Memoize dollar estimates of a :class:`BatchValuer`.
+
+    ``maxsize`` bounds the number of entries (least recently used are
+    evicted first) and ``ttl`` optionally expires entries after that many
+    seconds.
+    """
+
+    def __init__(self, valuer, maxsize=100_000, ttl=None, decimals=6, clock=time.monotonic):
+        if maxsize <= 0:
+            raise ValueError('maxsize must be positive')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.decimals = decimals
+        self.clock = clock
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        self._entries = OrderedDict()
+        self.set_model(valuer)
+
+    def set_model(self, valuer):
+        """Switch to ``valuer``; cached values of a different model are dropped."""
+        if getattr(self, 'valuer', None) is None or valuer.version != self.valuer.version:
+            self._entries.clear()
+        self.valuer = valuer
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+
+    def key(self, spec):
+        """Canonical cache key of a ``{feature: value}`` spec."""
+        row = self.valuer.baseline.copy()
+        for name, value in spec.items():
+            row[self.valuer.column(name)] = value
+        return self._row_key(row), row
+
+    def value(self, spec):
+        """Dollar estimate for one property spec."""
+        key, row = self.key(spec)
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+        dollars = float(self.valuer.value_matrix(row[None, :])[0])
+        self._put(key, dollars)
+        return dollars
+
+    def value_many(self, specs):
+        """Dollar estimates for a list of specs, pricing all misses in one batch."""
+        out = np.empty(len(specs))
+        missing, rows, keys = [], [], []
+        for i, spec in enumerate(specs):
+            key, row = self.key(spec)
+            cached = self._get(key)
+            if cached is None:
+                missing.append(i)
+                rows.append(row)
+                keys.append(key)
+            else:
+                out[i] = cached
+        if missing:
+            dollars = self.valuer.value_matrix(np.array(rows))
+            out[missing] = dollars
+            for key, value in zip(keys, dollars):
+                self._put(key, float(value))
+        return out
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'size': len(self._entries), 'maxsize': self.maxsize, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'model': self.valuer.version}
+
+    def _row_key(self, row):
+        # Adding 0.0 turns -0.0 into 0.0 so both round to the same bytes.
+        return self.valuer.version, (np.round(row, self.decimals) + 0.0).tobytes()
+
+    def _get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, stored = entry
+        if self.ttl is not None and self.clock() - stored > self.ttl:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def _put(self, key, value):
+        self._entries[key] = (value, self.clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
@@ -0,0 +1,157 @@
+"""Incremental model updates as new sales arrive or old ones are retracted.
+
+:class:`OnlineRegression` keeps the :class:`SufficientStats` of everything
+it has seen, so adding or removing rows costs ``O(p**2)`` per row and the
+coefficients are re-solved from the ``(p, p)`` Gram matrix without
+revisiting historical data::
+
+    model = OnlineRegression.load('state.npz')
+    model.add(new_X, new_price)
+    model.remove(retracted_X, retracted_price)
+    model.fits()['log_price'].coef_frame()   # the refreshed ``coef`` table
+    model.residual_summary()                 # R², residual mean and skew
+    model.save('state.npz')
+
+Residual mean and skew depend on the *current* coefficients, so they
+cannot be accumulated as plain running sums of residuals.  Instead the
+model keeps the third-order moment tensor of ``z = [1, x, y]``; the sums of
+``r``, ``r**2`` and ``r**3`` for any coefficients are then polynomial
+contractions of that tensor.  This costs ``O(d**3)`` per row with
+``d = 1 + p + n_targets`` (16 here) and can be switched off with
+``track_skew=False``.
+"""
+
+import numpy as np
+
+from . import FEATURES
+from .streaming import (SufficientStats, TARGET_TRANSFORMS, _as_2d, fits_from_stats,
+                        target_matrix)
+
+MOMENT_BLOCK_ROWS = 16_384
+
+
+class OnlineRegression:
+    """Least squares fits for several targets that can be updated in place."""
+
+    def __init__(self, target_names=tuple(TARGET_TRANSFORMS), feature_names=FEATURES,
+                 transforms=TARGET_TRANSFORMS, track_skew=True):
+        self.target_names = tuple(target_names)
+        self.feature_names = tuple(feature_names)
+        self.transforms = transforms
+        self.stats = SufficientStats(len(self.feature_names), len(self.target_names))
+        self.track_skew = track_skew
+        self.shift = None
+        self.moments = None
+
+    @property
+    def n(self):
+        return self.stats.n
+
+    def add(self, X, price):
+        """Fold in new rows; ``price`` is the raw ``PRICE`` column."""
+        X, Y = self._prepare(X, price)
+        self.stats.update(X, Y)
+        if self.track_skew:
+            self._update_moments(X, Y, 1)
+        return self
+
+    def remove(self, X, price):
+        """Retract rows that were added earlier."""
+        X, Y = self._prepare(X, price)
+        self.stats.subtract(SufficientStats.from_arrays(X, Y))
+        if self.track_skew:
+            self._update_moments(X, Y, -1)
+        return self
+
+    def fits(self):
+        """Current :class:`~house_prices.streaming.LinearFit` per target."""
+        return fits_from_stats(self.stats, self.target_names, self.feature_names)
+
+    def residual_summary(self):
+        """Training R², residual mean and residual skew per target.
+
+        Mean and skew match ``residuals.mean()`` and ``residuals.skew()`` on
+        the training residuals; skew is ``None`` when it is not tracked.
+        """
+        coef, intercept = self.stats.solve()
+        r2 = self.stats.rsquared(coef)
+        summary = {}
+        for j, name in enumerate(self.target_names):
+            mean = skew = None
+            if self.track_skew:
+                mean, skew = self._residual_mean_skew(coef[:, j], intercept[j], j)
+            summary[name] = {'rsquared': float(r2[j]), 'mean': mean, 'skew': skew}
+        return summary
+
+    def save(self, path):
+        """Persist the state to an ``.npz`` file (transforms are not saved)."""
+        s = self.stats
+        arrays = dict(n=np.int64(s.n), mean_x=s.mean_x, mean_y=s.mean_y, sxx=s.sxx,
+                      sxy=s.sxy, syy=s.syy,
+                      target_names=np.array(self.target_names),
+                      feature_names=np.array(self.feature_names),
+                      track_skew=np.bool_(self.track_skew))
+        if self.moments is not None:
+            arrays.update(shift=self.shift, moments=self.moments)
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path, transforms=TARGET_TRANSFORMS):
+        """Restore a state written by :meth:`save`."""
+        with np.load(path, allow_pickle=False) as state:
+            target_names = [str(name) for name in state['target_names']]
+            if list(transforms) != target_names:
+                raise ValueError(f'{path} holds targets {target_names}, '
+                                 f'transforms are for {list(transforms)}')
+            # Files saved before track_skew was stored only say so via moments.
+            track_skew = (bool(state['track_skew']) if 'track_skew' in state.files
+                          else 'moments' in state.files)
+            model = cls(target_names, [str(name) for name in state['feature_names']],
+                        transforms, track_skew)
+            s = model.stats
+            s.n = int(state['n'])
+            s.mean_x, s.mean_y = state['mean_x'], state['mean_y']
+            s.sxx, s.sxy, s.syy = state['sxx'], state['sxy'], state['syy']
+            if 'moments' in state.files:
+                model.shift, model.moments = state['shift'], state['moments']
+        return model
+
+    def _prepare(self, X, price):
+        X = _as_2d(X)
+        if X.shape[1] != len(self.feature_names):
+            raise ValueError(f'Expected {len(self.feature_names)} feature columns, '
+                             f'got {X.shape[1]}')
+        return X, target_matrix(np.asarray(price, dtype=np.float64).ravel(), self.transforms)
+
+    def _update_moments(self, X, Y, sign):
+        if not len(X):
+            return
+        Z = np.column_stack([np.ones(len(X)), X, Y])
+        if self.moments is None:
+            # Shift by the first batch's means to keep the raw moments small.
+            self.shift = np.concatenate([[0.0], Z[:, 1:].mean(axis=0)])
+            self.moments = np.zeros((Z.shape[1],) * 3)
+        Z -= self.shift
+        for start in range(0, len(Z), MOMENT_BLOCK_ROWS):
+            block = Z[start:start + MOMENT_BLOCK_ROWS]
+            outer = (block[:, :, None] * block[:, None, :]).reshape(len(block), -1)
+            self.moments += sign * (outer.T @ block).reshape(self.moments.shape)
+
+    def _residual_mean_skew(self, coef, intercept, target):
+        p = len(self.feature_names)
+        # r = y - intercept - x @ coef as a linear form over the shifted z.
+        w = np.zeros(self.moments.shape[0])
+        w[1:1 + p] = -coef
+        w[1 + p + target] = 1.0
+        w[0] = -intercept + w[1:] @ self.shift[1:]
+        s1 = self.moments[0, 0] @ w
+        s2 = w @ self.moments[0] @ w
+        s3 = np.einsum('ijk,i,j,k->', self.moments, w, w, w)
+        n = self.stats.n
+        mean = s1 / n
+        m2 = s2 / n - mean**2
+        m3 = s3 / n - 3 * mean * s2 / n + 2 * mean**3
+        if n < 3 or m2 <= 0:
+            return float(mean), float('nan')
+        skew = m3 / m2**1.5 * np.sqrt(n * (n - 1)) / (n - 2)
+        return float(mean), float(skew)
@@ -0,0 +1,104 @@
+"""Fit both regressions with a process pool over byte ranges of a CSV.
+
+The file is cut into line-aligned byte ranges, one per task.  Each worker
+parses its range in blocks and returns the :class:`SufficientStats` of its
+rows for every target transform; the parent merges them and solves once.
+``regression`` and ``log_regr`` therefore come out of a single pass::
+
+    fits = fit_csv_parallel('listings.csv', workers=8)
+
+Target transforms are sent to the workers, so they must be picklable
+(NumPy ufuncs such as ``np.log`` are, lambdas are not).
+"""
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from . import DATA_PATH, FEATURES
+from .streaming import SufficientStats, TARGET_TRANSFORMS, fits_from_stats, frame_stats
+
+BLOCK_BYTES = 64 * 1024 * 1024
+
+
+def read_header(path):
+    """Column names and the byte offset where the data rows start."""
+    with open(path, 'rb') as f:
+        header = f.readline()
+        return header.decode().rstrip('\r\n').split(','), f.tell()
+
+
+def byte_ranges(path, parts):
+    """Split the data rows of ``path`` into at most ``parts`` line-aligned ranges."""
+    _, start = read_header(path)
+    size = os.path.getsize(path)
+    bounds = [start]
+    with open(path, 'rb') as f:
+        for i in range(1, parts):
+            target = start + (size - start) * i // parts
+            if target <= bounds[-1]:
+                continue
+            f.seek(target - 1)
+            f.readline()  # finish the line that straddles the cut
+            offset = f.tell()
+            if bounds[-1] < offset < size:
+                bounds.append(offset)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def iter_blocks(path, start, end, block_bytes=BLOCK_BYTES):
+    """Yield the bytes of ``[start, end)`` in blocks that end on a newline."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        carry = b''
+        while remaining > 0:
+            data = f.read(min(block_bytes, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            data = carry + data
+            cut = data.rfind(b'\n') + 1 if remaining > 0 else len(data)
+            carry = data[cut:]
+            if cut:
+                yield data[:cut]
+        if carry:
+            yield carry
+
+
+def range_stats(path, start, end, names, transforms=TARGET_TRANSFORMS,
+                block_bytes=BLOCK_BYTES):
+    """Sufficient statistics of the rows in one byte range (runs in a worker)."""
+    stats = SufficientStats(len(FEATURES), len(transforms))
+    for block in iter_blocks(path, start, end, block_bytes):
+        frame = pd.read_csv(io.BytesIO(block), header=None, names=names, index_col=0)
+        stats.merge(frame_stats(frame, transforms))
+    return stats
+
+
+def accumulate_csv_parallel(path=DATA_PATH, workers=None, transforms=TARGET_TRANSFORMS,
+                            tasks_per_worker=4, block_bytes=BLOCK_BYTES):
+    """Merged :class:`SufficientStats` of ``path`` computed by ``workers`` processes."""
+    workers = workers or os.cpu_count() or 1
+    names, _ = read_header(path)
+    ranges = byte_ranges(path, workers * tasks_per_worker)
+    stats = SufficientStats(len(FEATURES), len(transforms))
+    if workers == 1:
+        for start, end in ranges:
+            stats.merge(range_stats(path, start, end, names, transforms, block_bytes))
+        return stats
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(range_stats, path, start, end, names, transforms, block_bytes)
+                   for start, end in ranges]
+        for future in futures:
+            stats.merge(future.result())
+    return stats
+
+
+def fit_csv_parallel(path=DATA_PATH, workers=None, transforms=TARGET_TRANSFORMS, **kwargs):
+    """Fit one :class:`~house_prices.streaming.LinearFit` per target in one parallel pass."""
+    stats = accumulate_csv_parallel(path, workers, transforms, **kwargs)
+    return fits_from_stats(stats, list(transforms))
@@ -0,0 +1,334 @@
+"""Headless, cached pipeline runner for the notebook's stages.
+
+Usage::
+
+    python -m house_prices.pipeline [--data data/boston.csv] [--no-plots]
+                                    [--cache-dir .pipeline_cache] [--force STAGE]
+
+The notebook export is one flat script; this runs the same work as explicit
+stages::
+
+    load -> validate -> split -> fit_raw, fit_log -> diagnose -> value -> plot
+
+Every stage's output is pickled under ``--cache-dir`` with a key hashed from
+the stage's code (its own source plus every ``house_prices`` module it
+imports, directly or through other package modules), its parameters and the
+keys of the stages it reads.  ``load`` is keyed on the CSV's sha256, which is
+only recomputed when the file's size or mtime changes.  A re-run loads
+unchanged stages from disk and recomputes only what changed downstream.
+Plots are written to files with the Agg backend and never shown;
+``--no-plots`` skips them entirely.
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import re
+import sys
+import time
+
+import numpy as np
+
+from . import DATA_PATH
+from .profiling import span
+
+CACHE_DIR = '.pipeline_cache'
+PLOTS_DIR = 'pipeline_plots'
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_RELATIVE_IMPORT = re.compile(r'^\s*from \.(\w*) import', re.MULTILINE)
+
+
+def package_imports(source):
+    """``house_prices`` modules imported by ``source`` with ``from .x import``."""
+    return {name or '__init__' for name in _RELATIVE_IMPORT.findall(source)}
+
+
+def module_closure(names):
+    """``names`` plus every package module they import, transitively."""
+    seen, pending = set(), list(names)
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        with open(os.path.join(PACKAGE_DIR, f'{name}.py')) as f:
+            pending.extend(package_imports(f.read()))
+    return seen
+
+
+def source_digest(path, cache_dir=CACHE_DIR):
+    """sha256 of ``path``, rehashed only when its size or mtime changed.
+
+    The last digest of each source is remembered in ``cache_dir``, the same
+    size+mtime fast path as :func:`house_prices.columnar.is_fresh`.
+    """
+    from .columnar import file_digest
+
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    index_path = os.path.join(cache_dir, 'sources.json')
+    try:
+        with open(index_path) as f:
+            sources = json.load(f)
+    except (OSError, ValueError):
+        sources = {}
+    known = sources.get(path)
+    if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+        return known['sha256']
+    digest = file_digest(path)
+    sources[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest}
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f'{index_path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(sources, f)
+    os.replace(tmp, index_path)
+    return digest
+
+
+class Stage:
+    """A named step computed from the outputs of ``deps`` and fixed ``params``.
+
+    ``stale`` optionally takes a cached output and returns True when it must
+    be recomputed anyway, e.g. because files it wrote were deleted.
+    """
+
+    def __init__(self, name, func, deps=(), params=None, stale=None):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.params = dict(params or {})
+        self.stale = stale
+
+    def code_digest(self):
+        """Hash of the stage function and of the package modules it relies on."""
+        try:
+            source = inspect.getsource(self.func)
+        except (OSError, TypeError):
+            source = getattr(self.func, '__qualname__', repr(self.func))
+        digest = hashlib.sha256(source.encode())
+        for name in sorted(module_closure(package_imports(source))):
+            with open(os.path.join(PACKAGE_DIR, f'{name}.py'), 'rb') as f:
+                digest.update(name.encode() + b'\0' + f.read())
+        return digest.hexdigest()
+
+    def key(self, dep_keys):
+        payload = json.dumps({'name': self.name,
+                              'code': self.code_digest(),
+                              'params': self.params,
+                              'deps': [dep_keys[d] for d in self.deps]},
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class Pipeline:
+    """Stages in dependency order with an on-disk cache of their outputs.
+
+    ``run`` returns ``{stage: output}`` and records in ``self.log`` whether
+    each stage was ``'cached'`` or ``'ran'`` and how long it took.  Each
+    stage runs inside a :func:`~house_prices.profiling.span` of its name, so
+    an active :class:`~house_prices.profiling.Profiler` sees it too.
+    """
+
+    def __init__(self, stages, cache_dir=CACHE_DIR):
+        self.stages = {}
+        for stage in stages:
+            missing = [d for d in stage.deps if d not in self.stages]
+            if missing:
+                raise ValueError(f'stage {stage.name!r} depends on unknown stages {missing}')
+            self.stages[stage.name] = stage
+        self.cache_dir = cache_dir
+        self.log = []
+
+    def _path(self, stage, key):
+        return os.path.join(self.cache_dir, f'{stage.name}-{key}.pkl')
+
+    def _load(self, path):
+        try:
+            with open(path, 'rb') as f:
+                return True, pickle.load(f)
+        except (OSError, EOFError, AttributeError, ImportError, pickle.UnpicklingError):
+            # AttributeError/ImportError: pickled by code that no longer exists.
+            return False, None
+
+    def _store(self, path, value):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def run(self, skip=(), force=()):
+        unknown = set(skip) | set(force)
+        unknown -= set(self.stages)
+        if unknown:
+            raise ValueError(f'unknown stages: {sorted(unknown)}')
+        outputs, keys = {}, {}
+        self.log = []
+        for name, stage in self.stages.items():
+            if name in skip or any(d not in outputs for d in stage.deps):
+                continue
+            keys[name] = key = stage.key(keys)
+            path = self._path(stage, key)
+            start = time.perf_counter()
+            with span(name) as record:
+                found, value = (False, None) if name in force else self._load(path)
+                if found and stage.stale and stage.stale(value):
+                    found = False
+                if not found:
+                    value = stage.func(*(outputs[d] for d in stage.deps), **stage.params)
+                    self._store(path, value)
+                status = 'cached' if found else 'ran'
+                if record is not None:
+                    record['status'] = status
+            outputs[name] = value
+            self.log.append({'stage': name, 'key': key, 'status': status,
+                             'seconds': time.perf_counter() - start})
+        return outputs
+
+
+def missing_files(paths):
+    """True if any of ``paths`` no longer exists."""
+    return not all(os.path.exists(p) for p in paths)
+
+
+def load_stage(path, digest):
+    from .data import load_data
+    return load_data(path)
+
+
+def validate_stage(data):
+    from .quality import scan_frame
+    report = scan_frame(data)
+    if not report.ok:
+        bad = report.columns[(report.columns['nulls'] > 0) | (report.columns['violations'] > 0)]
+        raise ValueError(f'data failed validation: {report.duplicate_rows} duplicate rows; '
+                         f'nulls/violations in {list(bad.index)}')
+    return report
+
+
+def split_stage(data, report):
+    from .data import split_features
+    from .split import TrainTestSplit
+    features, target = split_features(data)
+    split = TrainTestSplit(features)
+    X_train, X_test, y_train, y_test = split.split(target)
+    log_y_train, log_y_test = split.targets(np.log(target))
+    return {'features': features, 'X_train': X_train, 'X_test': X_test,
+            'y_train': y_train, 'y_test': y_test,
+            'log_y_train': log_y_train, 'log_y_test': log_y_test}
+
+
+def fit_raw_stage(split):
+    from sklearn.linear_model import LinearRegression
+    return LinearRegression().fit(split['X_train'], split['y_train'])
+
+
+def fit_log_stage(split):
+    from sklearn.linear_model import LinearRegression
+    return LinearRegression().fit(split['X_train'], split['log_y_train'])
+
+
+def diagnose_stage(split, regression, log_regr):
+    residuals = split['y_train'] - regression.predict(split['X_train'])
+    log_residuals = split['log_y_train'] - log_regr.predict(split['X_train'])
+    return {
+        'train_r2': regression.score(split['X_train'], split['y_train']),
+        'log_train_r2': log_regr.score(split['X_train'], split['log_y_train']),
+        'test_r2': regression.score(split['X_test'], split['y_test']),
+        'log_test_r2': log_regr.score(split['X_test'], split['log_y_test']),
+        'res_mean': round(residuals.mean(), 2),
+        'res_skew': round(residuals.skew(), 2),
+        'log_resid_mean': round(log_residuals.mean(), 2),
+        'log_resid_skew': round(log_residuals.skew(), 2),
+    }
+
+
+def value_stage(split, log_regr):
+    from .valuation import BatchValuer
+    valuer = BatchValuer.from_model(log_regr, split['features'])
+    return {'valuer': valuer,
+            'average_property_value': float(valuer.value()[0])}
+
+
+def plot_stage(data, split, regression, log_regr, diagnostics, plots_dir):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    os.makedirs(plots_dir, exist_ok=True)
+    written = []
+
+    def save(figure, name):
+        path = os.path.join(plots_dir, name)
+        figure.savefig(path)
+        plt.close(figure)
+        written.append(path)
+
+    X_train = split['X_train']
+    for label, model, y, colour, mean, skew in (
+            ('original', regression, split['y_train'], 'red',
+             diagnostics['res_mean'], diagnostics['res_skew']),
+            ('log', log_regr, split['log_y_train'], 'green',
+             diagnostics['log_resid_mean'], diagnostics['log_resid_skew'])):
+        predicted = model.predict(X_train)
+        figure = plt.figure()
+        plt.scatter(x=y, y=predicted, c=colour, alpha=0.6)
+        plt.plot(y, y, color='cyan')
+        plt.title(f'{label.capitalize()} model: Actual vs Predicted')
+        save(figure, f'{label}_actual_vs_predicted.png')
+        grid = sns.displot(y - predicted, kde=True, color=colour)
+        grid.figure.suptitle(f'{label.capitalize()} model: Residuals Skew ({skew}) Mean ({mean})')
+        save(grid.figure, f'{label}_residuals.png')
+    grid = sns.displot(data['PRICE'], bins=50, aspect=2, kde=True, color='#2196f3')
+    save(grid.figure, 'price_distribution.png')
+    return written
+
+
+def build_pipeline(path=DATA_PATH, plots_dir=PLOTS_DIR, cache_dir=CACHE_DIR):
+    """The notebook's stages for the CSV at ``path``."""
+    return Pipeline([
+        Stage('load', load_stage,
+              params={'path': str(path), 'digest': source_digest(path, cache_dir)}),
+        Stage('validate', validate_stage, ['load']),
+        Stage('split', split_stage, ['load', 'validate']),
+        Stage('fit_raw', fit_raw_stage, ['split']),
+        Stage('fit_log', fit_log_stage, ['split']),
+        Stage('diagnose', diagnose_stage, ['split', 'fit_raw', 'fit_log']),
+        Stage('value', value_stage, ['split', 'fit_log']),
+        Stage('plot', plot_stage, ['load', 'split', 'fit_raw', 'fit_log', 'diagnose'],
+              {'plots_dir': os.path.abspath(plots_dir)}, stale=missing_files),
+    ], cache_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default=str(DATA_PATH),
+                        help='CSV to load (default: %(default)s)')
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--plots-dir', default=PLOTS_DIR)
+    parser.add_argument('--no-plots', action='store_true', help='skip the plot stage')
+    parser.add_argument('--force', action='append', default=[], metavar='STAGE',
+                        help='recompute STAGE even if cached (repeatable)')
+    args = parser.parse_args(argv)
+
+    pipeline = build_pipeline(args.data, args.plots_dir, args.cache_dir)
+    try:
+        outputs = pipeline.run(skip={'plot'} if args.no_plots else (), force=args.force)
+    except ValueError as e:
+        print(f'error: {e}', file=sys.stderr)
+        return 1
+    for entry in pipeline.log:
+        print(f'{entry["stage"]:<10} {entry["status"]:<7} {entry["seconds"] * 1000:9.1f} ms  '
+              f'{entry["key"]}')
+    summary = dict(outputs['diagnose'],
+                   average_property_value=outputs['value']['average_property_value'])
+    print(json.dumps(summary, indent=2, default=float))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""Pair and joint plots drawn from pre-aggregated bin counts.
+
+``sns.pairplot(data)`` and the ``kind='hex'`` jointplots hand every raw row
+to matplotlib, so drawing time grows with the data.  :class:`BinnedPairs`
+first reduces the table to 1-D counts per column and 2-D counts for every
+column pair, in one vectorised pass per chunk, and the render functions
+below only ever see those counts::
+
+    binned = BinnedPairs.from_frame(data, bins=40)
+    pairplot(binned)
+    with sns.axes_style('darkgrid'):
+        jointplot(binned, 'DIS', 'NOX', joint_kws={'alpha': 0.5})
+
+Binning needs only NumPy; matplotlib and seaborn are imported when a chart
+is drawn.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+
+import numpy as np
+
+
+class BinnedPairs:
+    """Equal-width histograms of each column and of every pair of columns.
+
+    ``ranges`` maps each column to ``(low, high)``; values outside are
+    clipped into the first or last bin and non-finite values are skipped.
+    """
+
+    def __init__(self, columns, ranges, bins=50):
+        self.columns = tuple(columns)
+        self.bins = bins
+        self.low = np.array([ranges[c][0] for c in self.columns], dtype=np.float64)
+        self.high = np.array([ranges[c][1] for c in self.columns], dtype=np.float64)
+        span = self.high - self.low
+        self.width = np.where(span > 0, span / bins, 1.0)
+        self.pairs = list(combinations(range(len(self.columns)), 2))
+        self.marginals = np.zeros((len(self.columns), bins), dtype=np.int64)
+        self.joint = np.zeros((len(self.pairs), bins, bins), dtype=np.int64)
+        self._pair_index = {pair: k for k, pair in enumerate(self.pairs)}
+        self._position = {name: i for i, name in enumerate(self.columns)}
+
+    @classmethod
+    def from_frame(cls, data, bins=50, chunk_rows=1_000_000, workers=None):
+        """Bin an in-memory DataFrame, taking the ranges from its min and max."""
+        values = data.to_numpy(dtype=np.float64)
+        ranges = dict(zip(data.columns, zip(np.nanmin(values, axis=0),
+                                            np.nanmax(values, axis=0))))
+        binned = cls(data.columns, ranges, bins)
+        for start in range(0, len(values), chunk_rows):
+            binned.update(values[start:start + chunk_rows], workers)
+        return binned
+
+    def update(self, block, workers=None):
+        """Add an ``(n, n_columns)`` block of rows.
+
+        With ``workers`` > 1 the pairs are counted on a thread pool.
+        """
+        block = np.asarray(block, dtype=np.float64)
+        finite = np.isfinite(block)
+        codes = np.floor((block - self.low) / self.width)
+        codes = np.clip(np.nan_to_num(codes), 0, self.bins - 1).astype(np.intp)
+        all_finite = bool(finite.all())
+
+        for i in range(len(self.columns)):
+            col = codes[:, i] if all_finite else codes[finite[:, i], i]
+            self.marginals[i] += np.bincount(col, minlength=self.bins)
+
+        def count_pair(k):
+            i, j = self.pairs[k]
+            flat = codes[:, i] * self.bins + codes[:, j]
+            if not all_finite:
+                flat = flat[finite[:, i] & finite[:, j]]
+            return k, np.bincount(flat, minlength=self.bins**2).reshape(self.bins, self.bins)
+
+        if workers and workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(count_pair, range(len(self.pairs))))
+        else:
+            results = map(count_pair, range(len(self.pairs)))
+        for k, counts in results:
+            self.joint[k] += counts
+        return self
+
+    def merge(self, other):
+        """Add counts binned with the same columns, ranges and bins."""
+        if (self.columns != other.columns or self.bins != other.bins
+                or not np.array_equal(self.low, other.low)
+                or not np.array_equal(self.high, other.high)):
+            raise ValueError('Cannot merge BinnedPairs with different bins')
+        self.marginals += other.marginals
+        self.joint += other.joint
+        return self
+
+    def edges(self, column):
+        i = self._position[column]
+        return self.low[i] + self.width[i] * np.arange(self.bins + 1)
+
+    def centres(self, column):
+        edges = self.edges(column)
+        return (edges[:-1] + edges[1:]) / 2
+
+    def counts(self, column):
+        """1-D counts of ``column``."""
+        return self.marginals[self._position[column]]
+
+    def pair_counts(self, x, y):
+        """2-D counts indexed ``[x_bin, y_bin]``."""
+        i, j = self._position[x], self._position[y]
+        if i == j:
+            raise ValueError('x and y must be different columns')
+        if i < j:
+            return self.joint[self._pair_index[i, j]]
+        return self.joint[self._pair_index[j, i]].T
+
+
+def pairplot(binned, columns=None, height=2.5, color='C0', cmap='Blues'):
+    """Pair grid of binned counts: histograms on the diagonal, heatmaps elsewhere."""
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import LogNorm
+
+    columns = list(columns or binned.columns)
+    k = len(columns)
+    fig, axes = plt.subplots(k, k, figsize=(height * k, height * k), squeeze=False)
+    for r, y in enumerate(columns):
+        for c, x in enumerate(columns):
+            ax = axes[r, c]
+            if x == y:
+                ax.stairs(binned.counts(x), binned.edges(x), fill=True, color=color)
+            else:
+                counts = np.ma.masked_equal(binned.pair_counts(x, y).T, 0)
+                ax.pcolormesh(binned.edges(x), binned.edges(y), counts, cmap=cmap,
+                              norm=LogNorm(), shading='flat')
+            if r == k - 1:
+                ax.set_xlabel(x)
+            else:
+                ax.set_xticklabels([])
+            if c == 0:
+                ax.set_ylabel(y)
+            else:
+                ax.set_yticklabels([])
+    fig.tight_layout()
+    return fig
+
+
+def jointplot(binned, x, y, color='C0', height=6, gridsize=None, joint_kws=None,
+              marginal_kws=None):
+    """Hexbin jointplot of ``y`` against ``x`` drawn from binned counts.
+
+    Follows ``sns.jointplot(kind='hex')``: a colormap blended from
+    ``color`` and marginal histograms on the sides.  Each non-empty 2-D bin
+    is drawn as one weighted point, so cost depends on ``binned.bins``.
+    """
+    import matplotlib as mpl
+    import seaborn as sns
+    from seaborn.palettes import blend_palette
+    from seaborn.utils import set_hls_values
+
+    color_rgb = mpl.colors.colorConverter.to_rgb(color)
+    colors = [set_hls_values(color_rgb, l=val) for val in np.linspace(1, 0, 12)]
+    joint_kws = dict(joint_kws or {})
+    joint_kws.setdefault('cmap', blend_palette(colors, as_cmap=True))
+    joint_kws.setdefault('gridsize', gridsize or max(binned.bins // 2, 1))
+    marginal_kws = dict(marginal_kws or {})
+    marginal_kws.setdefault('color', color)
+
+    counts = binned.pair_counts(x, y)
+    xi, yi = np.nonzero(counts)
+    xc, yc = binned.centres(x), binned.centres(y)
+
+    grid = sns.JointGrid(height=height)
+    grid.ax_joint.hexbin(xc[xi], yc[yi], C=counts[xi, yi], reduce_C_function=np.sum,
+                         extent=(*binned.edges(x)[[0, -1]], *binned.edges(y)[[0, -1]]),
+                         **joint_kws)
+    grid.ax_marg_x.stairs(binned.counts(x), binned.edges(x), fill=True, **marginal_kws)
+    grid.ax_marg_y.stairs(binned.counts(y), binned.edges(y), fill=True,
+                          orientation='horizontal', **marginal_kws)
+    grid.set_axis_labels(x, y)
+    return grid
@@ -0,0 +1,53 @@
+"""NumPy-only loader for exported log-price models.
+
+Valuation workers only need ``coef_``, ``intercept_``, the feature order and
+the ``average_vals`` baseline, plus the optional per-feature quantile table.
+This module reads them from the ``.npz`` artifact written by
+:mod:`house_prices.export` without importing pandas or sklearn, so a cold
+start costs little more than ``import numpy``::
+
+    valuer = load_model('log_model.npz')
+    dollars = valuer.value({'RM': 8, 'CHAS': 1})
+    valuer.quantiles['NOX'].quantile(0.75)
+"""
+
+import numpy as np
+
+from .sketch import QuantileTable
+from .valuation import BatchValuer
+
+FORMAT_VERSION = 1
+
+
+def save_model(path, valuer):
+    """Write a :class:`BatchValuer` to ``path`` as an uncompressed ``.npz``."""
+    arrays = {}
+    if valuer.quantiles is not None:
+        arrays = {'quantile_columns': np.array(valuer.quantiles.columns),
+                  'quantile_grid': valuer.quantiles.grid,
+                  'quantile_counts': valuer.quantiles.counts}
+    np.savez(path,
+             format_version=np.int64(FORMAT_VERSION),
+             coef=valuer.coef,
+             intercept=np.float64(valuer.intercept),
+             feature_names=np.array(valuer.feature_names),
+             baseline=valuer.baseline,
+             **arrays)
+
+
+def load_model(path):
+    """Load an artifact written by :func:`save_model` into a :class:`BatchValuer`."""
+    with np.load(path, allow_pickle=False) as artifact:
+        version = int(artifact['format_version'])
+        if version != FORMAT_VERSION:
+            raise ValueError(f'{path}: unsupported model format version {version}')
+        quantiles = None
+        if 'quantile_grid' in artifact.files:
+            quantiles = QuantileTable([str(name) for name in artifact['quantile_columns']],
+                                      artifact['quantile_grid'],
+                                      artifact['quantile_counts'])
+        return BatchValuer(artifact['coef'],
+                           artifact['intercept'][()],
+                           [str(name) for name in artifact['feature_names']],
+                           artifact['baseline'],
+                           quantiles)
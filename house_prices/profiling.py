@@ -0,0 +1,280 @@
+"""Timing spans, per-stage memory peaks and diffable JSON run reports.
+
+Wrap each pipeline stage in a named span; spans nest, and every span
+records wall time, CPU time and peak memory.  Spans are reported in the
+order they started, and a name that repeats under the same parent gets a
+``#2``, ``#3``... suffix so every run of it stays visible.  Library code
+can call the module-level :func:`span`, which costs nothing unless a
+profiler is active::
+
+    profiler = Profiler(trace_memory=True)
+    with profiler.activate():
+        with span('load'):
+            data = load_data()
+        with span('fit'):
+            ...
+    profiler.write('run.json')
+
+Memory is the Python heap peak from :mod:`tracemalloc` (NumPy and pandas
+buffers included) when ``trace_memory=True``, otherwise the growth of the
+process's maximum resident set size.  ``cprofile=True`` also captures a
+:mod:`cProfile` profile of the whole run; its top functions go into the
+report and :meth:`Profiler.dump_stats` writes the raw ``.pstats``.
+
+``run`` profiles the stages of :mod:`house_prices.pipeline`, by default in
+a fresh cache directory so that every stage is computed.  Reports from two
+runs can be compared from the command line, which exits with status 1 when
+a stage got slower than the threshold::
+
+    python -m house_prices.profiling run --output new.json
+    python -m house_prices.profiling diff old.json new.json --threshold 0.2
+"""
+
+import argparse
+import cProfile
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPORT_VERSION = 1
+_active = None
+
+
+def span(name):
+    """Time ``name`` on the active profiler, or do nothing if there is none."""
+    if _active is None:
+        return contextlib.nullcontext()
+    return _active.span(name)
+
+
+def _max_rss_bytes():
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+class Profiler:
+    """Collect nested timing spans for one run."""
+
+    def __init__(self, trace_memory=False, cprofile=False):
+        self.trace_memory = trace_memory
+        self.spans = []
+        self._stack = []
+        self._seen = {}
+        self._profile = cProfile.Profile() if cprofile else None
+        self._started = None
+        self._wall = None
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Make this the profiler that :func:`span` reports to."""
+        global _active
+        previous, _active = _active, self
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self._profile:
+            self._profile.enable()
+        self._started = datetime.datetime.now(datetime.timezone.utc)
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self._wall = time.perf_counter() - start
+            if self._profile:
+                self._profile.disable()
+            if started_tracing:
+                tracemalloc.stop()
+            _active = previous
+
+    @contextlib.contextmanager
+    def span(self, name):
+        path = f'{self._stack[-1]["path"]}/{name}' if self._stack else name
+        self._seen[path] = count = self._seen.get(path, 0) + 1
+        if count > 1:
+            path = f'{path}#{count}'
+        record = {'name': path, 'depth': len(self._stack)}
+        self.spans.append(record)
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        frame = {'path': path}
+        if tracing:
+            # reset_peak() below would lose the enclosing spans' peaks, so
+            # fold the peak so far into every open span first.
+            self._fold_peak(tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            frame['base'] = frame['peak'] = tracemalloc.get_traced_memory()[0]
+        else:
+            frame['rss'] = _max_rss_bytes()
+        self._stack.append(frame)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall_s'] = time.perf_counter() - wall
+            record['cpu_s'] = time.process_time() - cpu
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                self._fold_peak(peak)
+                record['peak_bytes'] = frame['peak'] - frame['base']
+                record['retained_bytes'] = current - frame['base']
+            else:
+                record['peak_bytes'] = max(_max_rss_bytes() - frame['rss'], 0)
+            self._stack.pop()
+
+    def _fold_peak(self, peak):
+        for frame in self._stack:
+            frame['peak'] = max(frame.get('peak', 0), peak)
+
+    def top_functions(self, limit=25):
+        """Most expensive functions by cumulative time from the cProfile capture."""
+        if not self._profile:
+            return []
+        stats = pstats.Stats(self._profile, stream=io.StringIO())
+        rows = []
+        for (filename, line, func), (cc, nc, tt, ct, _) in stats.stats.items():
+            rows.append({'function': f'{filename}:{line}({func})', 'calls': nc,
+                         'total_s': tt, 'cumulative_s': ct})
+        rows.sort(key=lambda r: r['cumulative_s'], reverse=True)
+        return rows[:limit]
+
+    def dump_stats(self, path):
+        """Write the raw cProfile data for ``pstats``/``snakeviz``."""
+        if not self._profile:
+            raise ValueError('Profiler was created without cprofile=True')
+        self._profile.dump_stats(path)
+
+    def report(self):
+        """Machine-readable summary of the run."""
+        return {
+            'version': REPORT_VERSION,
+            'started': self._started.isoformat() if self._started else None,
+            'wall_s': self._wall,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'argv': sys.argv,
+            'memory': 'tracemalloc' if self.trace_memory else 'max_rss',
+            'spans': self.spans,
+            'top_functions': self.top_functions(),
+        }
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+
+def compare_reports(old, new, threshold=0.1, min_seconds=0.01):
+    """Stages whose wall time grew by more than ``threshold`` (a fraction).
+
+    Stages faster than ``min_seconds`` in both runs are ignored as noise.
+    Returns ``(regressions, changes)``: ``changes`` has one
+    ``{name, old_s, new_s, change, old_peak_bytes, new_peak_bytes}`` per
+    stage found in both reports, sorted by change (largest first), and
+    ``regressions`` is the part of it above ``threshold``.
+    """
+    before = dict(_numbered(old['spans']))
+    changes = []
+    for name, s in _numbered(new['spans']):
+        prev = before.get(name)
+        if prev is None or max(prev['wall_s'], s['wall_s']) < min_seconds:
+            continue
+        change = s['wall_s'] / prev['wall_s'] - 1 if prev['wall_s'] else float('inf')
+        changes.append({'name': name, 'old_s': prev['wall_s'], 'new_s': s['wall_s'],
+                        'change': change,
+                        'old_peak_bytes': prev.get('peak_bytes'),
+                        'new_peak_bytes': s.get('peak_bytes')})
+    changes.sort(key=lambda c: c['change'], reverse=True)
+    return [c for c in changes if c['change'] > threshold], changes
+
+
+def _numbered(spans):
+    """``(name, span)`` pairs with repeated names suffixed ``#2``, ``#3``...
+
+    Reports written by this version are already unique; older ones listed a
+    repeated span once per run under the same name.
+    """
+    seen = {}
+    for s in spans:
+        seen[s['name']] = count = seen.get(s['name'], 0) + 1
+        yield (s['name'] if count == 1 else f'{s["name"]}#{count}'), s
+
+
+def run_pipeline(path=None, plots=False, cache_dir=None):
+    """Run :func:`house_prices.pipeline.build_pipeline`'s stages.
+
+    Without ``cache_dir`` the stages run against an empty temporary cache,
+    so every one of them is computed; plots go to a temporary directory.
+    """
+    import tempfile
+
+    from . import DATA_PATH
+    from .pipeline import build_pipeline
+
+    with tempfile.TemporaryDirectory() as scratch:
+        pipeline = build_pipeline(path or DATA_PATH, os.path.join(scratch, 'plots'),
+                                  cache_dir or os.path.join(scratch, 'cache'))
+        return pipeline.run(skip=() if plots else {'plot'})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Profile the pipeline and compare runs.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help='profile the pipeline stages')
+    run.add_argument('--data', help='CSV to load (default: data/boston.csv)')
+    run.add_argument('--output', default='run_report.json')
+    run.add_argument('--plots', action='store_true', help='include the plot stage')
+    run.add_argument('--cache-dir', help='pipeline cache to reuse (default: a fresh one)')
+    run.add_argument('--tracemalloc', action='store_true', help='per-stage heap peaks')
+    run.add_argument('--cprofile', metavar='PSTATS', help='also write a cProfile capture')
+    diff = commands.add_parser('diff', help='compare two run reports')
+    diff.add_argument('old')
+    diff.add_argument('new')
+    diff.add_argument('--threshold', type=float, default=0.1,
+                      help='allowed slowdown as a fraction (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        # Under ``python -m`` this file runs as ``__main__``; the pipeline's
+        # spans report to the package module, so profile with that one.
+        from . import profiling
+
+        profiler = profiling.Profiler(trace_memory=args.tracemalloc,
+                                      cprofile=bool(args.cprofile))
+        with profiler.activate():
+            run_pipeline(args.data, args.plots, args.cache_dir)
+        profiler.write(args.output)
+        if args.cprofile:
+            profiler.dump_stats(args.cprofile)
+        for s in profiler.report()['spans']:
+            print(f'{"  " * s["depth"]}{s["name"].rsplit("/", 1)[-1]:<{24 - 2 * s["depth"]}}'
+                  f'{s["wall_s"] * 1000:10.1f} ms {s["peak_bytes"] / 2**20:9.1f} MiB'
+                  f'  {s.get("status", "")}')
+        print(f'Wrote {args.output}')
+        return 0
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    regressions, changes = compare_reports(old, new, args.threshold)
+    for c in changes:
+        flag = '  REGRESSION' if c in regressions else ''
+        print(f'{c["name"]:<28} {c["old_s"] * 1000:10.1f} -> {c["new_s"] * 1000:10.1f} ms '
+              f'{c["change"]:+7.1%}{flag}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""Fused one-pass data-quality scan.
+
+The cleaning section runs ``isna()`` twice, ``duplicated()``, ``count()``,
+``info()`` and ``describe()``: six full scans, and ``duplicated()`` hashes
+every row into a large temporary.  :class:`QualityScan` gathers all of it in
+a single chunked pass that never holds more than one chunk:
+
+* null counts per column;
+* duplicate rows from a 64-bit hash per row, kept either exactly (a sorted
+  array of seen hashes, 8 bytes per distinct row) or in a fixed-size Bloom
+  filter (bounded memory, rare false positives);
+* count/mean/std/min/max per column and :class:`QuantileSketch` quartiles;
+* domain checks: ``CHAS`` in {0, 1} and ``PRICE > 0`` (required by
+  ``np.log``) by default.
+
+::
+
+    report = scan_csv('listings.csv', chunksize=1_000_000)
+    report.ok, report.duplicate_rows
+    report.columns          # describe()-like table plus nulls and violations
+"""
+
+import numpy as np
+import pandas as pd
+
+from . import DATA_PATH
+from .sketch import DEFAULT_K, QuantileSketch
+
+_PRIME = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+_MAX_RUNS = 16
+
+
+def not_binary(values):
+    return ~np.isin(values, (0.0, 1.0)) & ~np.isnan(values)
+
+
+def not_positive(values):
+    return ~(values > 0) & ~np.isnan(values)
+
+
+DOMAIN_CHECKS = {'CHAS': not_binary, 'PRICE': not_positive}
+
+
+def _mix(h):
+    # splitmix64 finaliser
+    h = (h ^ (h >> np.uint64(30))) * _MIX1
+    h = (h ^ (h >> np.uint64(27))) * _MIX2
+    return h ^ (h >> np.uint64(31))
+
+
+def row_hashes(block):
+    """64-bit hash of every row of a float array (``-0.0 == 0.0``, all NaNs equal)."""
+    block = np.asarray(block, dtype=np.float64) + 0.0
+    block[np.isnan(block)] = np.nan
+    bits = np.ascontiguousarray(block).view(np.uint64)
+    h = np.full(len(block), np.uint64(len(block[0]) if len(block) else 0))
+    with np.errstate(over='ignore'):
+        for j in range(bits.shape[1]):
+            h = _mix((h ^ bits[:, j]) * _PRIME + np.uint64(j))
+    return h
+
+
+class ExactHashSet:
+    """Seen row hashes as a few sorted runs (merged when there are too many)."""
+
+    def __init__(self):
+        self.runs = []
+
+    def add_new(self, hashes):
+        """Add unique ``hashes``; returns the mask of those already present."""
+        seen = np.zeros(len(hashes), dtype=bool)
+        for run in self.runs:
+            idx = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            seen |= run[idx] == hashes
+        self.runs.append(np.sort(hashes[~seen]))
+        if len(self.runs) > _MAX_RUNS:
+            self.runs = [np.sort(np.concatenate(self.runs))]
+        return seen
+
+    @property
+    def nbytes(self):
+        return sum(run.nbytes for run in self.runs)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 64-bit hashes."""
+
+    def __init__(self, bits=1 << 30, k=7):
+        self.bits = int(bits)
+        self.k = k
+        self.words = np.zeros(-(-self.bits // 64), dtype=np.uint64)
+
+    def _positions(self, hashes):
+        h2 = _mix(hashes) | np.uint64(1)
+        with np.errstate(over='ignore'):
+            return [(hashes + np.uint64(i) * h2) % np.uint64(self.bits) for i in range(self.k)]
+
+    def add_new(self, hashes):
+        present = np.ones(len(hashes), dtype=bool)
+        positions = self._positions(hashes)
+        for pos in positions:
+            word, bit = pos >> np.uint64(6), np.uint64(1) << (pos & np.uint64(63))
+            present &= (self.words[word] & bit) != 0
+        for pos in positions:
+            word, bit = pos >> np.uint64(6), np.uint64(1) << (pos & np.uint64(63))
+            np.bitwise_or.at(self.words, word, bit)
+        return present
+
+    @property
+    def nbytes(self):
+        return self.words.nbytes
+
+
+class QualityReport:
+    """Result of a :class:`QualityScan`."""
+
+    def __init__(self, rows, duplicate_rows, columns, exact_duplicates):
+        self.rows = rows
+        self.duplicate_rows = duplicate_rows
+        self.columns = columns
+        self.exact_duplicates = exact_duplicates
+
+    @property
+    def has_nulls(self):
+        return bool(self.columns['nulls'].any())
+
+    @property
+    def has_duplicates(self):
+        return self.duplicate_rows > 0
+
+    @property
+    def ok(self):
+        """No nulls, no duplicates and no domain violations."""
+        return not (self.has_nulls or self.has_duplicates or self.columns['violations'].any())
+
+
+class QualityScan:
+    """Accumulate null, duplicate, summary and domain statistics chunk by chunk.
+
+    ``duplicates`` is ``'exact'``, ``'bloom'`` (with ``bloom_bits`` of
+    memory) or ``None`` to skip duplicate detection.
+    """
+
+    def __init__(self, columns, checks=DOMAIN_CHECKS, duplicates='exact', bloom_bits=1 << 30,
+                 sketch_k=DEFAULT_K):
+        self.columns = list(columns)
+        self.checks = {name: check for name, check in checks.items() if name in self.columns}
+        c = len(self.columns)
+        self.rows = 0
+        self.duplicate_rows = 0
+        self.count = np.zeros(c, dtype=np.int64)
+        self.mean = np.zeros(c)
+        self.m2 = np.zeros(c)
+        self.min = np.full(c, np.inf)
+        self.max = np.full(c, -np.inf)
+        self.violations = np.zeros(c, dtype=np.int64)
+        self.sketches = [QuantileSketch(sketch_k, seed=j) for j in range(c)]
+        self.duplicates = duplicates
+        if duplicates == 'exact':
+            self._seen = ExactHashSet()
+        elif duplicates == 'bloom':
+            self._seen = BloomFilter(bloom_bits)
+        elif duplicates is None:
+            self._seen = None
+        else:
+            raise ValueError(f'duplicates must be exact, bloom or None, not {duplicates!r}')
+
+    def update(self, block):
+        """Scan a DataFrame chunk (columns in ``self.columns``) or an array."""
+        if hasattr(block, 'columns'):
+            block = block[self.columns].to_numpy(dtype=np.float64)
+        block = np.asarray(block, dtype=np.float64)
+        if not len(block):
+            return self
+        self.rows += len(block)
+        finite = ~np.isnan(block)
+        count = finite.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, np.nansum(block, axis=0) / np.maximum(count, 1), 0.0)
+            m2 = np.nansum((block - mean)**2, axis=0)
+        total = self.count + count
+        delta = mean - self.mean
+        weight = np.divide(self.count * count, total, out=np.zeros(len(total)), where=total > 0)
+        self.m2 += m2 + delta**2 * weight
+        self.mean += np.divide(delta * count, total, out=np.zeros(len(total)), where=total > 0)
+        self.count = total
+        if finite.any():
+            self.min = np.fmin(self.min, np.nanmin(np.where(finite, block, np.inf), axis=0))
+            self.max = np.fmax(self.max, np.nanmax(np.where(finite, block, -np.inf), axis=0))
+        for j, sketch in enumerate(self.sketches):
+            sketch.update(block[:, j])
+        for name, check in self.checks.items():
+            j = self.columns.index(name)
+            self.violations[j] += int(np.count_nonzero(check(block[:, j])))
+        if self._seen is not None:
+            hashes = row_hashes(block)
+            unique = np.unique(hashes)
+            self.duplicate_rows += len(hashes) - len(unique)
+            self.duplicate_rows += int(np.count_nonzero(self._seen.add_new(unique)))
+        return self
+
+    def report(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(self.m2 / (self.count - 1))
+        quartiles = np.array([s.quantile([0.25, 0.5, 0.75]) if s.n else [np.nan] * 3
+                              for s in self.sketches])
+        table = pd.DataFrame({
+            'count': self.count,
+            'nulls': self.rows - self.count,
+            'mean': np.where(self.count > 0, self.mean, np.nan),
+            'std': std,
+            'min': np.where(self.count > 0, self.min, np.nan),
+            '25%': quartiles[:, 0],
+            '50%': quartiles[:, 1],
+            '75%': quartiles[:, 2],
+            'max': np.where(self.count > 0, self.max, np.nan),
+            'violations': self.violations,
+        }, index=self.columns)
+        return QualityReport(self.rows, self.duplicate_rows, table, self.duplicates == 'exact')
+
+
+def scan_frame(data, chunk_rows=1_000_000, **kwargs):
+    """Scan an in-memory DataFrame in chunks."""
+    scan = QualityScan(data.columns, **kwargs)
+    for start in range(0, len(data), chunk_rows):
+        scan.update(data.iloc[start:start + chunk_rows])
+    return scan.report()
+
+
+def scan_csv(path=DATA_PATH, chunksize=1_000_000, **kwargs):
+    """Scan a CSV in the ``boston.csv`` layout without loading it whole."""
+    scan = None
+    for chunk in pd.read_csv(path, index_col=0, chunksize=chunksize):
+        if scan is None:
+            scan = QualityScan(chunk.columns, **kwargs)
+        scan.update(chunk)
+    if scan is None:
+        raise ValueError(f'{path} has no data rows')
+    return scan.report()
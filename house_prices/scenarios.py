@@ -0,0 +1,145 @@
+"""What-if sensitivity grids over property characteristics.
+
+The notebook answers one hypothetical at a time (``nr_rooms = 8``,
+``students_per_classroom = 20`` ...).  A :class:`ScenarioGrid` evaluates
+every combination of per-feature values at once.  Because the model is
+linear in the features, the log price over the Cartesian product is an
+outer *sum* of one small vector per axis, so the grid is never built row by
+row::
+
+    grid = ScenarioGrid(valuer, {'RM': np.arange(4, 9.5, 0.5),
+                                 'PTRATIO': np.arange(12, 23),
+                                 'DIS': np.arange(1, 13),
+                                 'NOX': Quantiles([0.25, 0.5, 0.75])},
+                        fixed={'CHAS': 1}, data=data)
+    result = grid.evaluate()          # labelled (11, 11, 12, 3) array
+    for flat, dollars in grid.blocks(1_000_000):
+        ...                           # bounded memory for huge grids
+"""
+
+import numpy as np
+
+from . import PRICE_UNIT
+from .valuation import to_dollars
+
+
+class Quantiles:
+    """Axis given as quantiles of a feature, resolved against ``data``."""
+
+    def __init__(self, q):
+        self.q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+
+    def resolve(self, name, data):
+        if data is None:
+            raise ValueError(f'Quantile axis for {name!r} needs data= to resolve against')
+        return np.quantile(np.asarray(data[name], dtype=np.float64), self.q)
+
+
+class ScenarioResult:
+    """N-d grid of estimates labelled with the axis names and values."""
+
+    def __init__(self, values, dims, coords):
+        self.values = values
+        self.dims = tuple(dims)
+        self.coords = coords
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def sel(self, **points):
+        """Sub-grid at the coordinates nearest to ``points`` (one value per axis)."""
+        index = []
+        for dim in self.dims:
+            if dim in points:
+                index.append(int(np.abs(self.coords[dim] - points[dim]).argmin()))
+            else:
+                index.append(slice(None))
+        dims = [d for d in self.dims if d not in points]
+        return ScenarioResult(self.values[tuple(index)], dims,
+                              {d: self.coords[d] for d in dims})
+
+    def to_series(self, name='PRICE'):
+        """Flatten into a pandas Series with one MultiIndex level per axis."""
+        import pandas as pd
+
+        index = pd.MultiIndex.from_product([self.coords[d] for d in self.dims], names=self.dims)
+        return pd.Series(self.values.ravel(), index=index, name=name)
+
+
+class ScenarioGrid:
+    """Cartesian product of feature values priced by a :class:`BatchValuer`.
+
+    ``axes`` maps a feature to the values it takes (an array or
+    :class:`Quantiles`); ``fixed`` maps features to a single value applied to
+    every scenario.  All other features stay at the valuer's baseline.
+    """
+
+    def __init__(self, valuer, axes, fixed=None, data=None):
+        self.valuer = valuer
+        self.dims = tuple(axes)
+        self.coords = {}
+        for name, values in axes.items():
+            if isinstance(values, Quantiles):
+                values = values.resolve(name, data)
+            self.coords[name] = np.atleast_1d(np.asarray(values, dtype=np.float64))
+        self.fixed = {}
+        for name, value in (fixed or {}).items():
+            if name in self.coords:
+                raise ValueError(f'{name!r} is both an axis and a fixed value')
+            if isinstance(value, Quantiles):
+                value = value.resolve(name, data).item()
+            self.fixed[name] = float(value)
+
+        offset = valuer.baseline_log
+        for name, value in self.fixed.items():
+            col = valuer.column(name)
+            offset += (value - valuer.baseline[col]) * valuer.coef[col]
+        self._offset = offset
+        # Contribution of each axis value relative to the baseline.
+        self._terms = [(self.coords[name] - valuer.baseline[valuer.column(name)])
+                       * valuer.coef[valuer.column(name)] for name in self.dims]
+
+    @property
+    def shape(self):
+        return tuple(len(self.coords[d]) for d in self.dims)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    def log_estimates(self):
+        """Full N-d array of log price estimates, built by broadcasting."""
+        out = np.full(self.shape, self._offset)
+        ndim = len(self.dims)
+        for axis, term in enumerate(self._terms):
+            shape = [1] * ndim
+            shape[axis] = -1
+            out += term.reshape(shape)
+        return out
+
+    def evaluate(self):
+        """Dollar estimates over the whole grid as a :class:`ScenarioResult`."""
+        values = self.log_estimates()
+        np.exp(values, out=values)
+        values *= PRICE_UNIT
+        return ScenarioResult(values, self.dims, dict(self.coords))
+
+    def blocks(self, block_size=1_000_000, dollars=True):
+        """Yield ``(flat_positions, estimates)`` over the row-major flattened grid.
+
+        Only one block of ``block_size`` scenarios is materialised at a time;
+        ``np.unravel_index(flat_positions, grid.shape)`` recovers the
+        coordinates of each estimate.
+        """
+        for start in range(0, self.size, block_size):
+            flat = np.arange(start, min(start + block_size, self.size))
+            out = np.full(len(flat), self._offset)
+            for term, idx in zip(self._terms, np.unravel_index(flat, self.shape)):
+                out += term[idx]
+            yield flat, to_dollars(out) if dollars else out
+
+    def scenarios(self, flat_positions):
+        """Feature values of the scenarios at ``flat_positions`` as a dict of arrays."""
+        idx = np.unravel_index(np.asarray(flat_positions), self.shape)
+        return {name: self.coords[name][i] for name, i in zip(self.dims, idx)}
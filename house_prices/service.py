@@ -0,0 +1,216 @@
+"""Local HTTP valuation service with micro-batching.
+
+Loads an exported log-price model once (see :mod:`house_prices.export`) and
+values property specs posted as JSON.  Features left out of a spec keep
+their ``features.mean()`` baseline, as in the notebook's ``property_stats``::
+
+    python -m house_prices.service log_model.npz --port 8080
+
+    POST /value  {"RM": 8, "PTRATIO": 20, "CHAS": 1}
+              -> {"log_estimate": 3.19, "value": 24296.3}
+    POST /value  [{"RM": 6}, {"RM": 7}]     (list in, list out)
+    GET  /health -> {"model": "<version>", "features": [...]}
+
+Requests that arrive within ``max_delay`` seconds of each other are priced
+together by one :meth:`BatchValuer.value_matrix` call.  Only the standard
+library and NumPy are used.
+"""
+
+import argparse
+import asyncio
+import json
+
+import numpy as np
+
+from .predictor import load_model
+from .valuation import to_dollars
+
+MAX_BODY_BYTES = 1 << 20
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large'}
+
+
+class MicroBatcher:
+    """Coalesce concurrent valuation requests into batched predictions."""
+
+    def __init__(self, valuer, max_delay=0.002, max_batch=1024):
+        self.valuer = valuer
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.batches = 0
+        self.rows = 0
+        self._queue = None
+        self._task = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def spec_row(self, spec):
+        """Turn a ``{feature: value}`` dict into a spec row (``NaN`` = baseline)."""
+        if not isinstance(spec, dict):
+            raise ValueError('Each property spec must be a JSON object')
+        row = np.full(len(self.valuer.feature_names), np.nan)
+        for name, value in spec.items():
+            column = self.valuer.column(name)
+            value = float(value)
+            if not np.isfinite(value):
+                raise ValueError(f'{name} must be a finite number, got {value}')
+            row[column] = value
+        return row
+
+    async def value(self, rows):
+        """Log and dollar estimates for an ``(n, n_features)`` array of spec rows."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((rows, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + self.max_delay
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+            self._price(pending)
+
+    def _price(self, pending):
+        specs = np.concatenate([rows for rows, _ in pending])
+        log_estimates = self.valuer.log_estimates_matrix(specs)
+        dollars = to_dollars(log_estimates)
+        self.batches += 1
+        self.rows += len(specs)
+        start = 0
+        for rows, future in pending:
+            stop = start + len(rows)
+            if not future.cancelled():
+                future.set_result((log_estimates[start:stop], dollars[start:stop]))
+            start = stop
+
+
+class ValuationServer:
+    """Minimal HTTP/1.1 server (keep-alive, JSON bodies) around a :class:`MicroBatcher`."""
+
+    def __init__(self, valuer, max_delay=0.002, max_batch=1024):
+        self.valuer = valuer
+        self.batcher = MicroBatcher(valuer, max_delay, max_batch)
+        self.server = None
+
+    async def start(self, host='127.0.0.1', port=8080):
+        self.batcher.start()
+        self.server = await asyncio.start_server(self._handle, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def stop(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.batcher.stop()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {'error': 'request body too large'}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                status, payload = await self._route(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        if path == '/health':
+            return 200, {'model': self.valuer.version, 'features': self.valuer.feature_names}
+        if path != '/value':
+            return 404, {'error': f'no route for {path}'}
+        if method != 'POST':
+            return 405, {'error': 'use POST'}
+        try:
+            specs = json.loads(body or b'{}')
+            single = isinstance(specs, dict)
+            rows = np.array([self.batcher.spec_row(s) for s in ([specs] if single else specs)])
+            if not len(rows):
+                return 200, []
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {'error': str(e.args[0]) if e.args else str(e)}
+        log_estimates, dollars = await self.batcher.value(rows)
+        if not np.isfinite(dollars).all():
+            return 400, {'error': 'property spec is too far out of range to value'}
+        results = [{'log_estimate': float(l), 'value': float(d)}
+                   for l, d in zip(log_estimates, dollars)]
+        return 200, results[0] if single else results
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        head = (f'HTTP/1.1 {status} {REASONS[status]}\r\n'
+                f'Content-Type: application/json\r\n'
+                f'Content-Length: {len(body)}\r\n'
+                f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n')
+        writer.write(head.encode() + body)
+        await writer.drain()
+
+
+async def serve(model_path, host='127.0.0.1', port=8080, max_delay=0.002, max_batch=1024):
+    server = ValuationServer(load_model(model_path), max_delay, max_batch)
+    host, port = await server.start(host, port)
+    print(f'Serving model {server.valuer.version} on http://{host}:{port}', flush=True)
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve property valuations over HTTP.')
+    parser.add_argument('model', help='.npz artifact written by house_prices.export')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--max-delay-ms', type=float, default=2.0,
+                        help='how long to wait for more requests to batch (default: %(default)s)')
+    parser.add_argument('--max-batch', type=int, default=1024)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.model, args.host, args.port, args.max_delay_ms / 1000,
+                          args.max_batch))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
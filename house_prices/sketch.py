@@ -0,0 +1,225 @@
+"""Mergeable quantile sketch for streaming passes.
+
+Exact quantiles need every value sorted.  :class:`QuantileSketch` is a
+KLL-style sketch: values enter level 0, and whenever a level outgrows its
+capacity it is sorted and every other item (random offset) is promoted to
+the next level with double the weight.  Memory is ``O(k log(n / k))``,
+rank error is roughly ``1.7 / k``, and sketches built on different chunks
+or workers merge level by level::
+
+    sketch = QuantileSketch()
+    for chunk in chunks:
+        sketch.update(chunk['NOX'].values)
+    sketch.quantile(0.75)
+
+:class:`QuantileTable` freezes one sketch per column into a fixed grid of
+quantiles, so ``table['NOX'].quantile(0.75)`` is an index and one linear
+interpolation.  It is built in the same streaming pass as the data load
+(:func:`sketch_csv`, :func:`sketch_frame`) and saved inside the exported
+model (:mod:`house_prices.predictor`)::
+
+    table = QuantileTable.from_sketches(sketch_csv('listings.csv'))
+    table['LSTAT'].quantile(0.25)
+"""
+
+import numpy as np
+
+DEFAULT_K = 1024
+SHRINK = 2 / 3
+RESOLUTION = 1000
+
+
+class QuantileSketch:
+    """Approximate quantiles of a stream of floats (NaNs are ignored)."""
+
+    def __init__(self, k=DEFAULT_K, seed=None):
+        self.k = k
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - 1 - level
+        return max(int(np.ceil(self.k * SHRINK**depth)), 2)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        self.n += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold another sketch into this one, in place."""
+        if other.n == 0:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            items = self.levels[h]
+            if len(items) > self._capacity(h):
+                items = np.sort(items)
+                keep = items[len(items) - len(items) % 2:]
+                promoted = items[self._rng.integers(2):len(items) - len(keep):2]
+                self.levels[h] = keep
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def weighted_items(self):
+        """Sorted retained items and their weights."""
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0**h)
+                                  for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], weights[order]
+
+    def quantile(self, q):
+        """Approximate ``q``-quantile(s); ``q`` may be a scalar or an array.
+
+        Each retained item stands at the centre of the ranks it represents
+        and quantiles interpolate linearly between items, so while nothing
+        has been compacted the result equals ``Series.quantile(q)``.
+        """
+        if self.n == 0:
+            raise ValueError('quantile of an empty sketch')
+        q = np.asarray(q, dtype=np.float64)
+        items, weights = self.weighted_items()
+        if len(items) == 1:
+            return np.full(q.shape, items[0]) if q.ndim else float(items[0])
+        positions = np.cumsum(weights) - (weights + 1) / 2
+        positions = (positions - positions[0]) / (positions[-1] - positions[0])
+        out = np.interp(q, positions, items)
+        out = np.where(q <= 0, self.min, np.where(q >= 1, self.max, out))
+        return out if out.ndim else float(out)
+
+    def __len__(self):
+        return sum(len(level) for level in self.levels)
+
+
+class QuantileTable:
+    """Per-column quantiles on a grid of ``resolution + 1`` evenly spaced levels.
+
+    ``grid[j, i]`` is column ``j``'s ``i / resolution`` quantile.  Lookups
+    interpolate between neighbouring grid points; the error is the sketch's
+    rank error plus at most ``1 / resolution`` in rank.
+    """
+
+    def __init__(self, columns, grid, counts):
+        self.columns = tuple(columns)
+        self.grid = np.asarray(grid, dtype=np.float64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        if self.grid.ndim != 2 or len(self.grid) != len(self.columns):
+            raise ValueError('grid must have one row per column')
+        self.resolution = self.grid.shape[1] - 1
+        self._index = {name: j for j, name in enumerate(self.columns)}
+
+    @classmethod
+    def from_sketches(cls, sketches, resolution=RESOLUTION):
+        """Freeze a ``{column: QuantileSketch}`` mapping."""
+        levels = np.linspace(0, 1, resolution + 1)
+        grid = [sketch.quantile(levels) if sketch.n else np.full(len(levels), np.nan)
+                for sketch in sketches.values()]
+        return cls(list(sketches), np.reshape(grid, (len(sketches), len(levels))),
+                   [sketch.n for sketch in sketches.values()])
+
+    @classmethod
+    def from_frame(cls, frame, resolution=RESOLUTION, **kwargs):
+        return cls.from_sketches(sketch_frame(frame, **kwargs), resolution)
+
+    def quantile(self, column, q):
+        """Approximate ``q``-quantile(s) of ``column`` in O(1) per ``q``."""
+        try:
+            row = self.grid[self._index[column]]
+        except KeyError:
+            raise KeyError(f'No quantiles for column {column!r}') from None
+        q = np.asarray(q, dtype=np.float64)
+        if np.any((q < 0) | (q > 1)):
+            raise ValueError('quantiles must be between 0 and 1')
+        position = q * self.resolution
+        i = np.minimum(position.astype(np.int64), self.resolution - 1)
+        frac = position - i
+        out = row[i] + (row[i + 1] - row[i]) * frac
+        return out if out.ndim else float(out)
+
+    def __getitem__(self, column):
+        return _ColumnQuantiles(self, column)
+
+    def to_frame(self, q=(0.01, 0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99)):
+        """Selected quantiles of every column, one row per column."""
+        import pandas as pd
+
+        return pd.DataFrame([self.quantile(c, q) for c in self.columns],
+                            index=list(self.columns), columns=list(q))
+
+
+class _ColumnQuantiles:
+    """``table['NOX'].quantile(0.75)``, mirroring ``data.NOX.quantile(q=0.75)``."""
+
+    def __init__(self, table, column):
+        self.table = table
+        self.column = column
+
+    def quantile(self, q=0.5):
+        return self.table.quantile(self.column, q)
+
+
+def new_sketches(columns, k=DEFAULT_K, seed=0):
+    return {name: QuantileSketch(k, seed=seed + j) for j, name in enumerate(columns)}
+
+
+def update_sketches(sketches, frame):
+    """Feed a DataFrame chunk into ``{column: QuantileSketch}``."""
+    for name, sketch in sketches.items():
+        sketch.update(frame[name].to_numpy(dtype=np.float64))
+    return sketches
+
+
+def merge_sketches(sketches, other):
+    """Merge two ``{column: QuantileSketch}`` mappings (e.g. from workers)."""
+    for name, sketch in other.items():
+        if name in sketches:
+            sketches[name].merge(sketch)
+        else:
+            sketches[name] = sketch
+    return sketches
+
+
+def sketch_frame(frame, chunk_rows=1_000_000, k=DEFAULT_K, seed=0):
+    """Sketch every column of an in-memory DataFrame."""
+    sketches = new_sketches(frame.columns, k, seed)
+    for start in range(0, len(frame), chunk_rows):
+        update_sketches(sketches, frame.iloc[start:start + chunk_rows])
+    return sketches
+
+
+def sketch_csv(path, chunksize=1_000_000, columns=None, k=DEFAULT_K, seed=0):
+    """Sketch the columns of a CSV in the ``boston.csv`` layout in one pass."""
+    import pandas as pd
+
+    sketches = None
+    for chunk in pd.read_csv(path, index_col=0, chunksize=chunksize):
+        if sketches is None:
+            sketches = new_sketches(columns or chunk.columns, k, seed)
+        update_sketches(sketches, chunk)
+    if sketches is None:
+        raise ValueError(f'{path} has no data rows')
+    return sketches
@@ -0,0 +1,66 @@
+"""Train/test split computed once and shared by every target.
+
+The notebook calls ``train_test_split`` twice with ``random_state=10``, once
+for ``PRICE`` and once for ``np.log(data['PRICE'])``, and each call copies
+the feature rows again.  :class:`TrainTestSplit` draws the permutation once,
+gathers ``X_train``/``X_test`` once, and only gathers the (1-D) target for
+each additional target::
+
+    split = TrainTestSplit(features)
+    y_train, y_test = split.targets(target)
+    log_y_train, log_y_test = split.targets(np.log(target))
+
+The row order matches ``train_test_split(..., shuffle=True)`` exactly, so
+results stay identical to the notebook's.
+"""
+
+import math
+from functools import cached_property
+
+import numpy as np
+
+
+def split_indices(n_samples, test_size=0.2, random_state=10):
+    """``(train_index, test_index)`` positions as drawn by ``train_test_split``."""
+    if not 0 < test_size < 1:
+        raise ValueError(f'test_size must be between 0 and 1, got {test_size}')
+    n_test = math.ceil(test_size * n_samples)
+    if not 0 < n_test < n_samples:
+        raise ValueError(f'test_size={test_size} leaves an empty split of {n_samples} rows')
+    permutation = np.random.RandomState(random_state).permutation(n_samples)
+    return permutation[n_test:], permutation[:n_test]
+
+
+def take_rows(a, positions):
+    """Rows of a DataFrame, Series or array at integer ``positions``."""
+    if hasattr(a, 'iloc'):
+        return a.iloc[positions]
+    return np.take(a, positions, axis=0)
+
+
+class TrainTestSplit:
+    """One seeded split of ``features`` that any number of targets can reuse."""
+
+    def __init__(self, features, test_size=0.2, random_state=10):
+        self.features = features
+        self.test_size = test_size
+        self.random_state = random_state
+        self.train_index, self.test_index = split_indices(len(features), test_size, random_state)
+
+    @cached_property
+    def X_train(self):
+        return take_rows(self.features, self.train_index)
+
+    @cached_property
+    def X_test(self):
+        return take_rows(self.features, self.test_index)
+
+    def targets(self, target):
+        """``(y_train, y_test)`` for a target aligned with ``features``."""
+        if len(target) != len(self.features):
+            raise ValueError(f'target has {len(target)} rows, features have {len(self.features)}')
+        return take_rows(target, self.train_index), take_rows(target, self.test_index)
+
+    def split(self, target):
+        """``X_train, X_test, y_train, y_test`` in ``train_test_split`` order."""
+        return (self.X_train, self.X_test) + self.targets(target)
@@ -0,0 +1,216 @@
+"""Fit the regressions from sufficient statistics, one chunk at a time.
+
+``LinearRegression().fit`` needs the whole design matrix in memory.  An
+ordinary least squares fit with an intercept only depends on the row count,
+the column means and the centred cross products ``X'X``, ``X'y`` and
+``y'y``, all of which can be accumulated chunk by chunk and merged.  Memory
+is bounded by the ``(p, p)`` Gram matrix no matter how many rows stream
+through::
+
+    fits = fit_csv('listings.csv', chunksize=1_000_000)
+    fits['log_price'].coef_
+
+Statistics are kept centred and merged with the pairwise update of Chan et
+al., which stays accurate where raw ``sum(x * x)`` accumulation would lose
+digits to cancellation.
+"""
+
+import numpy as np
+import pandas as pd
+
+from . import DATA_PATH, FEATURES, TARGET
+
+# Target transforms fitted by default: ``regression`` and ``log_regr``.
+TARGET_TRANSFORMS = {'price': None, 'log_price': np.log}
+
+
+class SufficientStats:
+    """Mergeable centred moments of features ``X`` and targets ``Y``.
+
+    ``Y`` may hold several targets as columns; they share the feature
+    statistics, so fitting ``PRICE`` and ``log(PRICE)`` costs one pass.
+    """
+
+    def __init__(self, n_features, n_targets=1):
+        self.n = 0
+        self.mean_x = np.zeros(n_features)
+        self.mean_y = np.zeros(n_targets)
+        self.sxx = np.zeros((n_features, n_features))
+        self.sxy = np.zeros((n_features, n_targets))
+        self.syy = np.zeros(n_targets)
+
+    @classmethod
+    def from_arrays(cls, X, Y):
+        """Statistics of a single in-memory block."""
+        X, Y = _as_2d(X), _as_2d(Y)
+        stats = cls(X.shape[1], Y.shape[1])
+        n = len(X)
+        if n:
+            stats.n = n
+            stats.mean_x = X.mean(axis=0)
+            stats.mean_y = Y.mean(axis=0)
+            Xc = X - stats.mean_x
+            Yc = Y - stats.mean_y
+            stats.sxx = Xc.T @ Xc
+            stats.sxy = Xc.T @ Yc
+            stats.syy = np.einsum('ij,ij->j', Yc, Yc)
+        return stats
+
+    @property
+    def n_features(self):
+        return len(self.mean_x)
+
+    @property
+    def n_targets(self):
+        return len(self.mean_y)
+
+    def copy(self):
+        other = SufficientStats(self.n_features, self.n_targets)
+        other.n = self.n
+        other.mean_x = self.mean_x.copy()
+        other.mean_y = self.mean_y.copy()
+        other.sxx = self.sxx.copy()
+        other.sxy = self.sxy.copy()
+        other.syy = self.syy.copy()
+        return other
+
+    def update(self, X, Y):
+        """Fold a block of rows into the statistics in place."""
+        return self.merge(SufficientStats.from_arrays(X, Y))
+
+    def merge(self, other):
+        """Combine with the statistics of a disjoint set of rows, in place."""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(other.copy().__dict__)
+            return self
+        n = self.n + other.n
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        w = self.n * other.n / n
+        self.sxx += other.sxx + w * np.outer(dx, dx)
+        self.sxy += other.sxy + w * np.outer(dx, dy)
+        self.syy += other.syy + w * dy * dy
+        self.mean_x += dx * (other.n / n)
+        self.mean_y += dy * (other.n / n)
+        self.n = n
+        return self
+
+    def subtract(self, other):
+        """Remove the statistics of a subset of the rows, in place.
+
+        The exact inverse of :meth:`merge`, for retracting rows that were
+        folded in earlier.
+        """
+        if other.n == 0:
+            return self
+        if other.n > self.n:
+            raise ValueError(f'Cannot remove {other.n} rows from statistics of {self.n}')
+        n = self.n - other.n
+        if n == 0:
+            self.__dict__.update(SufficientStats(self.n_features, self.n_targets).__dict__)
+            return self
+        mean_x = (self.n * self.mean_x - other.n * other.mean_x) / n
+        mean_y = (self.n * self.mean_y - other.n * other.mean_y) / n
+        dx = other.mean_x - mean_x
+        dy = other.mean_y - mean_y
+        w = n * other.n / self.n
+        self.sxx -= other.sxx + w * np.outer(dx, dx)
+        self.sxy -= other.sxy + w * np.outer(dx, dy)
+        self.syy -= other.syy + w * dy * dy
+        self.mean_x, self.mean_y, self.n = mean_x, mean_y, n
+        return self
+
+    def __add__(self, other):
+        return self.copy().merge(other)
+
+    def __sub__(self, other):
+        return self.copy().subtract(other)
+
+    def solve(self):
+        """Least squares ``(coef, intercept)``; ``coef`` has shape ``(p, k)``."""
+        if self.n == 0:
+            raise ValueError('Cannot fit a model on zero rows')
+        try:
+            coef = np.linalg.solve(self.sxx, self.sxy)
+        except np.linalg.LinAlgError:
+            coef = np.linalg.lstsq(self.sxx, self.sxy, rcond=None)[0]
+        intercept = self.mean_y - self.mean_x @ coef
+        return coef, intercept
+
+    def rsquared(self, coef):
+        """Training R² per target for least squares coefficients ``coef``."""
+        sse = self.syy - np.einsum('ij,ij->j', coef, self.sxy)
+        return 1 - sse / self.syy
+
+
+class LinearFit:
+    """Fitted linear model with the attributes the notebook reads.
+
+    Mirrors ``LinearRegression`` closely enough (``coef_``, ``intercept_``,
+    ``feature_names_in_``, ``predict``) to be used in its place.
+    """
+
+    def __init__(self, coef, intercept, feature_names, rsquared=None, n_samples=None):
+        self.coef_ = np.asarray(coef, dtype=np.float64)
+        self.intercept_ = float(intercept)
+        self.feature_names_in_ = np.array(feature_names, dtype=object)
+        self.rsquared = rsquared
+        self.n_samples = n_samples
+
+    def predict(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.coef_ + self.intercept_
+
+    def coef_frame(self, column='Coefficient'):
+        """The coefficients as the notebook's ``coef`` DataFrame."""
+        return pd.DataFrame(data=self.coef_, index=self.feature_names_in_, columns=[column])
+
+
+def fits_from_stats(stats, target_names, feature_names=FEATURES):
+    """Solve ``stats`` and wrap each target's solution in a :class:`LinearFit`."""
+    coef, intercept = stats.solve()
+    r2 = stats.rsquared(coef)
+    return {name: LinearFit(coef[:, j], intercept[j], feature_names, float(r2[j]), stats.n)
+            for j, name in enumerate(target_names)}
+
+
+def target_matrix(price, transforms=TARGET_TRANSFORMS):
+    """Stack the transformed targets as the columns of one array."""
+    price = np.asarray(price, dtype=np.float64)
+    return np.column_stack([price if f is None else f(price) for f in transforms.values()])
+
+
+def frame_stats(frame, transforms=TARGET_TRANSFORMS):
+    """:class:`SufficientStats` of a DataFrame with the ``boston.csv`` columns."""
+    X = frame[list(FEATURES)].to_numpy(dtype=np.float64)
+    return SufficientStats.from_arrays(X, target_matrix(frame[TARGET].values, transforms))
+
+
+def accumulate_csv(path=DATA_PATH, chunksize=1_000_000, transforms=TARGET_TRANSFORMS,
+                   include=None):
+    """Stream ``path`` into a :class:`SufficientStats`.
+
+    ``include`` optionally restricts the fit to rows whose index label (the
+    CSV's first column) is in it, e.g. ``X_train.index`` to reproduce a fit
+    on the notebook's training split.
+    """
+    stats = SufficientStats(len(FEATURES), len(transforms))
+    if include is not None:
+        include = np.asarray(include)
+    for chunk in pd.read_csv(path, index_col=0, chunksize=chunksize):
+        if include is not None:
+            chunk = chunk[np.isin(chunk.index.values, include)]
+        stats.merge(frame_stats(chunk, transforms))
+    return stats
+
+
+def fit_csv(path=DATA_PATH, chunksize=1_000_000, transforms=TARGET_TRANSFORMS, include=None):
+    """Fit one :class:`LinearFit` per target transform in a single streaming pass."""
+    stats = accumulate_csv(path, chunksize, transforms, include)
+    return fits_from_stats(stats, list(transforms))
+
+
+def _as_2d(a):
+    a = np.asarray(a, dtype=np.float64)
+    return a.reshape(-1, 1) if a.ndim == 1 else a
@@ -0,0 +1,158 @@
+"""Search Box-Cox / Yeo-Johnson target transforms over a cached QR.
+
+The notebook compares ``data['PRICE'].skew()`` with the skew of
+``np.log(data['PRICE'])`` and refits with ``new_target``.  A transform only
+changes the target, never the design matrix, so :class:`TransformSearch`
+factors ``[1, X_train] = QR`` once; every lambda then costs ``Q'z`` and a
+triangular solve, and all lambdas are solved together as columns of one
+right-hand side::
+
+    search = TransformSearch(X_train, X_test)
+    table = search.scan(y_train, y_test, family='box-cox')
+    search.best(table)          # lowest back-transformed test RMSE
+
+For each lambda the table reports residual skew (as ``Series.skew``),
+train and test R² on the transformed scale, and test error in dollars after
+reversing the transform.  Box-Cox with ``lambda = 0`` is the notebook's log
+model.  Predictions that fall outside the range of a transform cannot be
+reversed, and some overflow when reversed; every non-finite dollar value
+is counted in ``invalid_predictions`` and left out of the dollar errors,
+and :meth:`TransformSearch.best` skips those lambdas.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import solve_triangular
+
+from . import PRICE_UNIT
+from .diagnostics import RunningMoments
+
+DEFAULT_LAMBDAS = np.round(np.linspace(-1, 2, 31), 10)
+
+
+def box_cox(y, lam):
+    """Box-Cox transform of positive ``y``; ``lam == 0`` is ``np.log``."""
+    y = np.asarray(y, dtype=np.float64)
+    if np.any(y <= 0):
+        raise ValueError('Box-Cox needs strictly positive targets')
+    return np.log(y) if lam == 0 else np.expm1(lam * np.log(y)) / lam
+
+
+def inverse_box_cox(z, lam):
+    z = np.asarray(z, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        return np.exp(z) if lam == 0 else np.exp(np.log1p(lam * z) / lam)
+
+
+def yeo_johnson(y, lam):
+    """Yeo-Johnson transform, defined for any real ``y``."""
+    y = np.asarray(y, dtype=np.float64)
+    out = np.empty_like(y)
+    pos = y >= 0
+    if lam == 0:
+        out[pos] = np.log1p(y[pos])
+    else:
+        out[pos] = np.expm1(lam * np.log1p(y[pos])) / lam
+    if lam == 2:
+        out[~pos] = -np.log1p(-y[~pos])
+    else:
+        out[~pos] = -np.expm1((2 - lam) * np.log1p(-y[~pos])) / (2 - lam)
+    return out
+
+
+def inverse_yeo_johnson(z, lam):
+    z = np.asarray(z, dtype=np.float64)
+    out = np.empty_like(z)
+    pos = z >= 0
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        if lam == 0:
+            out[pos] = np.expm1(z[pos])
+        else:
+            out[pos] = np.expm1(np.log1p(lam * z[pos]) / lam)
+        if lam == 2:
+            out[~pos] = -np.expm1(-z[~pos])
+        else:
+            out[~pos] = -np.expm1(np.log1p(-(2 - lam) * z[~pos]) / (2 - lam))
+    return out
+
+
+FAMILIES = {
+    'box-cox': (box_cox, inverse_box_cox),
+    'yeo-johnson': (yeo_johnson, inverse_yeo_johnson),
+}
+
+CRITERIA = {
+    'dollar_rmse': ('test_dollar_rmse', True),
+    'dollar_mae': ('test_dollar_mae', True),
+    'skew': ('abs_skew', True),
+    'test_r2': ('test_r2', False),
+}
+
+
+class TransformSearch:
+    """Least squares fits of many target transforms on one fixed design."""
+
+    def __init__(self, X_train, X_test=None):
+        X_train = np.asarray(X_train, dtype=np.float64)
+        design = np.column_stack([np.ones(len(X_train)), X_train])
+        self.Q, self.R = np.linalg.qr(design)
+        self.X_test = None
+        if X_test is not None:
+            X_test = np.asarray(X_test, dtype=np.float64)
+            self.X_test = np.column_stack([np.ones(len(X_test)), X_test])
+
+    def solve(self, Z):
+        """Coefficients (intercept first) for each column of targets ``Z``."""
+        return solve_triangular(self.R, self.Q.T @ Z)
+
+    def scan(self, y_train, y_test=None, lambdas=DEFAULT_LAMBDAS, family='box-cox'):
+        """Evaluate every lambda of ``family``; returns one table row per lambda."""
+        forward, inverse = FAMILIES[family]
+        lambdas = np.atleast_1d(np.asarray(lambdas, dtype=np.float64))
+        y_train = np.asarray(y_train, dtype=np.float64)
+        Z = np.column_stack([forward(y_train, lam) for lam in lambdas])
+        beta = self.solve(Z)
+        fitted = self.Q @ (self.Q.T @ Z)
+        residuals = Z - fitted
+        moments = RunningMoments.from_array(residuals)
+        table = pd.DataFrame({
+            'lambda': lambdas,
+            'residual_skew': moments.skew(),
+            'train_r2': 1 - moments.m2 / RunningMoments.from_array(Z).m2,
+        })
+        table['abs_skew'] = table['residual_skew'].abs()
+
+        if y_test is not None and self.X_test is not None:
+            y_test = np.asarray(y_test, dtype=np.float64)
+            Z_test = np.column_stack([forward(y_test, lam) for lam in lambdas])
+            predicted = self.X_test @ beta
+            sse = ((Z_test - predicted)**2).sum(axis=0)
+            table['test_r2'] = 1 - sse / RunningMoments.from_array(Z_test).m2
+            dollars = np.column_stack([inverse(predicted[:, i], lam)
+                                       for i, lam in enumerate(lambdas)]) * PRICE_UNIT
+            invalid = ~np.isfinite(dollars)
+            dollars[invalid] = np.nan
+            errors = dollars - y_test[:, None] * PRICE_UNIT
+            table['test_dollar_rmse'] = np.sqrt(np.nanmean(errors**2, axis=0))
+            table['test_dollar_mae'] = np.nanmean(np.abs(errors), axis=0)
+            table['invalid_predictions'] = invalid.sum(axis=0)
+        table.insert(0, 'family', family)
+        return table
+
+    @staticmethod
+    def best(table, criterion='dollar_rmse'):
+        """Row of ``table`` that is best under ``criterion``.
+
+        ``criterion`` is one of ``'dollar_rmse'``, ``'dollar_mae'``,
+        ``'skew'`` (residual skew closest to zero) or ``'test_r2'``.
+        """
+        column, ascending = CRITERIA[criterion]
+        if column not in table:
+            raise ValueError(f'{criterion!r} needs test data in the scan')
+        candidates = table
+        if 'invalid_predictions' in table:
+            candidates = table[table['invalid_predictions'] == 0]
+            if candidates.empty:
+                raise ValueError('every lambda gives invalid (non-finite) test predictions')
+        ranked = candidates.sort_values(column, ascending=ascending)
+        return ranked.iloc[0]
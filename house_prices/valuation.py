@@ -0,0 +1,135 @@
+"""Vectorised property valuation with the fitted log-price model.
+
+The notebook values one property at a time: it builds a one-row
+``property_stats`` DataFrame from ``features.mean()``, overwrites a few
+columns and calls ``log_regr.predict``.  :class:`BatchValuer` does the same
+for any number of properties at once, straight from ``coef_`` and
+``intercept_``::
+
+    valuer = BatchValuer.from_model(log_regr, features)
+    dollars = valuer.value({'RM': [6, 7, 8], 'CHAS': 1, 'PTRATIO': 20})
+"""
+
+import hashlib
+
+import numpy as np
+
+from . import PRICE_UNIT
+
+
+class BatchValuer:
+    """Price arrays of property specs against a linear log-price model.
+
+    Every property starts from ``baseline`` (the average property) and only
+    the overridden features differ, so the log estimate is the baseline
+    estimate plus ``(override - baseline) @ coef`` over the touched columns.
+    ``quantiles`` is an optional :class:`~house_prices.sketch.QuantileTable`
+    of the training features, for inputs like ``quantiles['NOX'].quantile(0.75)``.
+    """
+
+    def __init__(self, coef, intercept, feature_names, baseline, quantiles=None):
+        self.coef = np.asarray(coef, dtype=np.float64).ravel()
+        self.intercept = float(intercept)
+        self.feature_names = tuple(feature_names)
+        self.baseline = np.asarray(baseline, dtype=np.float64).ravel()
+        self.quantiles = quantiles
+        if not (len(self.coef) == len(self.feature_names) == len(self.baseline)):
+            raise ValueError('coef, feature_names and baseline must have the same length')
+        self._index = {name: i for i, name in enumerate(self.feature_names)}
+        self.baseline_log = float(self.baseline @ self.coef) + self.intercept
+        self.version = model_version(self.coef, self.intercept, self.feature_names)
+
+    @classmethod
+    def from_model(cls, model, features, quantiles=None):
+        """Build from a fitted ``LinearRegression`` and the ``features`` frame."""
+        return cls(model.coef_, model.intercept_, features.columns, features.mean().values,
+                   quantiles)
+
+    def column(self, name):
+        """Position of feature ``name`` in the coefficient vector."""
+        try:
+            return self._index[name]
+        except KeyError:
+            raise KeyError(f'Unknown feature {name!r}') from None
+
+    def log_estimates(self, overrides=None, n=None):
+        """Log price estimates for a batch of properties.
+
+        ``overrides`` maps feature names to a scalar or a 1-D array; scalars
+        apply to every property and arrays must share one length.  Features
+        that are not mentioned keep their baseline value.  ``n`` is only
+        needed when every override is a scalar (or there are none).
+        """
+        columns, values, n = self._parse_overrides(overrides, n)
+        estimates = np.full(n, self.baseline_log)
+        if columns:
+            deltas = np.empty((n, len(columns)))
+            for j, (col, v) in enumerate(zip(columns, values)):
+                deltas[:, j] = v
+                deltas[:, j] -= self.baseline[col]
+            estimates += deltas @ self.coef[columns]
+        return estimates
+
+    def feature_matrix(self, overrides=None, n=None):
+        """Full ``(n, n_features)`` rows: the baseline with ``overrides`` applied.
+
+        Takes the same arguments as :meth:`log_estimates`.
+        """
+        columns, values, n = self._parse_overrides(overrides, n)
+        X = np.tile(self.baseline, (n, 1))
+        for col, v in zip(columns, values):
+            X[:, col] = v
+        return X
+
+    def _parse_overrides(self, overrides, n):
+        overrides = overrides or {}
+        columns = [self.column(name) for name in overrides]
+        values = [np.asarray(v, dtype=np.float64) for v in overrides.values()]
+        if n is None:
+            lengths = {len(v) for v in values if v.ndim}
+            if len(lengths) > 1:
+                raise ValueError(f'Override arrays have different lengths: {sorted(lengths)}')
+            n = lengths.pop() if lengths else 1
+        return columns, values, n
+
+    def predict(self, X):
+        """Log price estimates for complete feature rows.
+
+        Computes ``X @ coef + intercept`` exactly like
+        ``LinearRegression.predict`` so results match it bit for bit.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        return X @ self.coef + self.intercept
+
+    def log_estimates_matrix(self, specs):
+        """Log price estimates for a full ``(n, n_features)`` spec matrix.
+
+        ``NaN`` entries mean "keep the baseline value" for that feature.
+        """
+        specs = np.asarray(specs, dtype=np.float64)
+        if specs.ndim != 2 or specs.shape[1] != len(self.coef):
+            raise ValueError(f'specs must have shape (n, {len(self.coef)}), got {specs.shape}')
+        X = np.where(np.isnan(specs), self.baseline, specs)
+        return X @ self.coef + self.intercept
+
+    def value(self, overrides=None, n=None):
+        """Dollar estimates, i.e. ``np.exp(log_estimate) * 1000`` per property."""
+        return to_dollars(self.log_estimates(overrides, n))
+
+    def value_matrix(self, specs):
+        """Dollar estimates for a spec matrix, see :meth:`log_estimates_matrix`."""
+        return to_dollars(self.log_estimates_matrix(specs))
+
+
+def model_version(coef, intercept, feature_names):
+    """Short content hash identifying a fitted model."""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(coef, dtype=np.float64).tobytes())
+    digest.update(np.float64(intercept).tobytes())
+    digest.update(','.join(feature_names).encode())
+    return digest.hexdigest()[:16]
+
+
+def to_dollars(log_estimates):
+    """Reverse the log transform and convert from $1000's to dollars."""
+    return np.exp(log_estimates) * PRICE_UNIT